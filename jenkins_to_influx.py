@@ -20,6 +20,18 @@ INFLUX_URL = os.getenv('INFLUX_URL', '')
 INFLUX_DB = os.getenv('INFLUX_DB', 'jenkins')
 MEASUREMENT = os.getenv('MEASUREMENT', 'jenkins_custom_data')
 
+# Build fields fetched in the job listing; the user causes come along so no per-build request is needed
+BUILD_TREE = 'builds[number,timestamp,duration,result,url,actions[causes[userId,userName,shortDescription]]]'
+
+# Points are buffered and written in batches, flushed on whichever limit is hit first
+INFLUX_BATCH_SIZE = int(os.getenv('INFLUX_BATCH_SIZE', '5000'))
+INFLUX_BATCH_BYTES = int(os.getenv('INFLUX_BATCH_BYTES', str(1024 * 1024)))
+
+# How already-inserted builds are detected: 'view' loads every stored build number of
+# a view in one query, 'job' does one query per job, 'build' one query per build
+DEDUP_MODE = os.getenv('DEDUP_MODE', 'view').lower()
+DEDUP_MODES = ('view', 'job', 'build')
+
 # =========================
 # LOGGING SETUP
 # =========================
@@ -29,6 +41,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class InfluxBatchWriter:
+    """Buffers line-protocol points and writes them to InfluxDB in batches"""
+
+    def __init__(self, send, max_lines=INFLUX_BATCH_SIZE, max_bytes=INFLUX_BATCH_BYTES):
+        # send(payload) posts one batch and returns True when InfluxDB accepted it
+        self.send = send
+        self.max_lines = max(1, max_lines)
+        self.max_bytes = max(1, max_bytes)
+        self.lines = []
+        self.labels = []
+        self.size = 0
+        self.written = 0
+        self.failed = 0
+
+    def add(self, line, label=None):
+        line_size = len(line.encode('utf-8')) + 1
+        if self.lines and self.size + line_size > self.max_bytes:
+            self.flush()
+        self.lines.append(line)
+        self.labels.append(label)
+        self.size += line_size
+        if len(self.lines) >= self.max_lines:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered points as one batch, returns False if the batch failed"""
+        if not self.lines:
+            return True
+        lines, labels = self.lines, self.labels
+        self.lines, self.labels, self.size = [], [], 0
+
+        if self.send('\n'.join(lines)):
+            self.written += len(lines)
+            logger.info(f"Wrote batch of {len(lines)} point(s) to InfluxDB")
+            for label in labels:
+                if label:
+                    logger.info(f" {label}")
+            return True
+
+        self.failed += len(lines)
+        logger.error(f"Failed to write batch of {len(lines)} point(s) to InfluxDB")
+        for label in labels:
+            if label:
+                logger.error(f" Failed to insert {label}")
+        return False
+
 class JenkinsInfluxCollector:
     def __init__(self):
         # Validate required environment variables
@@ -38,6 +96,9 @@ class JenkinsInfluxCollector:
         if not JENKINS_TOKEN:
             logger.error("JENKINS_TOKEN environment variable is required but not set")
             sys.exit(1)
+        if DEDUP_MODE not in DEDUP_MODES:
+            logger.error(f"DEDUP_MODE must be one of {', '.join(DEDUP_MODES)}, got '{DEDUP_MODE}'")
+            sys.exit(1)
             
         self.jenkins_url = JENKINS_URL.rstrip('/')
         self.jenkins_user = JENKINS_USER
@@ -49,6 +110,10 @@ class JenkinsInfluxCollector:
         self.auth = HTTPBasicAuth(self.jenkins_user, self.jenkins_token)
         self.session = requests.Session()
         self.session.auth = self.auth
+        # Separate keep-alive session for InfluxDB so writes and dedup queries reuse one
+        # connection and the Jenkins credentials are never sent to InfluxDB
+        self.influx_session = requests.Session()
+        self.writer = InfluxBatchWriter(self.write_points)
         
         logger.info("=== JENKINS TO INFLUXDB DATA COLLECTOR ===")
         logger.info(f"Jenkins URL: {self.jenkins_url}")
@@ -84,9 +149,9 @@ class JenkinsInfluxCollector:
         url = f"{self.influx_url}{endpoint}"
         try:
             if method == 'POST':
-                response = requests.post(url, data=data, timeout=10)
+                response = self.influx_session.post(url, data=data, timeout=10)
             else:
-                response = requests.get(url, timeout=10)
+                response = self.influx_session.get(url, timeout=10)
             response.raise_for_status()
             return response
         except requests.exceptions.RequestException as e:
@@ -151,20 +216,18 @@ class JenkinsInfluxCollector:
                        f"user_name=\"{escaped_user_name}\" "
                        f"{build_time_ns}")
 
-            response = self.make_influx_request(f"/write?db={self.influx_db}", data=payload, method='POST')
-
-            if response:
-                logger.info(f" {project_name} #{build_number} → User: {user_name}")
-                return True
-            else:
-                logger.error(f" Failed to insert {project_name} #{build_number}")
-                return False
+            self.writer.add(payload, f"{project_name} #{build_number} → User: {user_name}")
+            return True
         except Exception as e:
             logger.error(f"Error inserting build into InfluxDB: {e}")
             return False
 
+    def write_points(self, payload):
+        response = self.make_influx_request(f"/write?db={self.influx_db}", data=payload.encode('utf-8'), method='POST')
+        return response is not None
+
     def get_job_builds(self, job_name, job_full_name):
-        endpoint = f"/job/{job_name}/api/json?tree=builds[number,timestamp,duration,result,url]"
+        endpoint = f"/job/{job_name}/api/json?tree={BUILD_TREE}"
         job_data = self.make_jenkins_request(endpoint)
         if not job_data:
             return []
@@ -173,6 +236,19 @@ class JenkinsInfluxCollector:
         detailed_builds = []
 
         for build in builds:
+            if 'actions' in build:
+                # User causes came with the listing
+                detailed_builds.append({
+                    'number': build['number'],
+                    'timestamp': build.get('timestamp', 0),
+                    'duration': build.get('duration', 0),
+                    'result': build.get('result', 'UNKNOWN'),
+                    'url': build.get('url', ''),
+                    'user_info': self.extract_user_info(build)
+                })
+                continue
+
+            # Fall back to the build's own endpoint when the listing lacks its actions
             build_number = build['number']
             build_details = self.make_jenkins_request(f"/job/{job_name}/{build_number}/api/json")
             if build_details:
@@ -206,6 +282,50 @@ class JenkinsInfluxCollector:
             logger.warning(f"Error checking duplicate: {e}")
             return False
 
+    def query_influx(self, query):
+        """Run an InfluxQL query and return its series, or None if the query failed"""
+        encoded_query = urllib.parse.quote(query)
+        response = self.make_influx_request(f"/query?db={self.influx_db}&q={encoded_query}")
+        if response is None:
+            return None
+        try:
+            results = response.json().get('results', [])
+        except ValueError as e:
+            logger.warning(f"Error parsing InfluxDB query response: {e}")
+            return None
+        series = []
+        for result in results:
+            if 'error' in result:
+                logger.warning(f"InfluxDB query error: {result['error']}")
+                return None
+            series.extend(result.get('series', []))
+        return series
+
+    def get_inserted_build_numbers(self, view_name, project_name=None, project_path=None):
+        """Fetch stored build numbers of a view (or one job) in a single query.
+
+        Returns a dict mapping (project_name, project_path) to a set of build numbers,
+        or None when InfluxDB could not be queried.
+        """
+        conditions = [f"view='{self.escape_influx_query(view_name)}'"]
+        if project_path is not None:
+            conditions.append(f"project_name='{self.escape_influx_query(project_name)}'")
+            conditions.append(f"project_path='{self.escape_influx_query(project_path)}'")
+        query = f"SELECT build_number FROM {self.measurement} WHERE {' AND '.join(conditions)} " \
+                f"GROUP BY project_name, project_path"
+        series = self.query_influx(query)
+        if series is None:
+            return None
+
+        inserted = {}
+        for serie in series:
+            tags = serie.get('tags', {})
+            key = (tags.get('project_name', ''), tags.get('project_path', ''))
+            column = serie.get('columns', []).index('build_number')
+            numbers = inserted.setdefault(key, set())
+            numbers.update(row[column] for row in serie.get('values', []) if row[column] is not None)
+        return inserted
+
     def get_jenkins_views(self):
         jenkins_data = self.make_jenkins_request('/api/json?tree=views[name,url,jobs[name,fullName,url]]')
         if not jenkins_data:
@@ -223,8 +343,10 @@ class JenkinsInfluxCollector:
             return False
 
         total_jobs_processed = 0
-        total_builds_processed = 0
+        queued_builds = 0
         skipped_builds = 0
+        written_before = self.writer.written
+        failed_before = self.writer.failed
         user_stats = {}
 
         for view in views:
@@ -234,11 +356,17 @@ class JenkinsInfluxCollector:
             if view_name.lower() == 'monitoring':
                 continue
             jobs = view.get('jobs', [])
+            view_inserted = self.get_inserted_build_numbers(view_name) if DEDUP_MODE == 'view' and jobs else None
             for job in jobs:
                 job_name = job['name']
                 job_full_name = job.get('fullName', job_name)
                 total_jobs_processed += 1
                 builds = self.get_job_builds(job_name, job_full_name)
+                if DEDUP_MODE == 'job' and builds:
+                    inserted = self.get_inserted_build_numbers(view_name, job_name, job_full_name)
+                else:
+                    inserted = view_inserted
+                known_builds = inserted.get((job_name, job_full_name), set()) if inserted is not None else None
                 for build in builds:
                     build_number = build['number']
                     user_name = build.get('user_info', 'Unknown')
@@ -248,15 +376,25 @@ class JenkinsInfluxCollector:
                     else:
                         user_stats[user_name] = 1
                     
-                    if not self.is_build_already_inserted(job_name, job_full_name, view_name, build_number):
+                    if known_builds is not None:
+                        already_inserted = build_number in known_builds
+                    else:
+                        already_inserted = self.is_build_already_inserted(job_name, job_full_name, view_name, build_number)
+                    if not already_inserted:
                         if self.insert_build_to_influx(job_name, job_full_name, view_name, build):
-                            total_builds_processed += 1
+                            queued_builds += 1
                     else:
                         skipped_builds += 1
 
+        self.writer.flush()
+        total_builds_processed = self.writer.written - written_before
+        failed_builds = self.writer.failed - failed_before
+
         logger.info(f"Total jobs processed: {total_jobs_processed}")
         logger.info(f"Total new builds inserted: {total_builds_processed}")
         logger.info(f"Total builds skipped: {skipped_builds}")
+        if failed_builds:
+            logger.error(f"Total builds failed to insert: {failed_builds} of {queued_builds}")
         logger.info("=== USER ACTIVITY ===")
         for user, count in sorted(user_stats.items(), key=lambda x: x[1], reverse=True):
             logger.info(f"{user}: {count} builds")
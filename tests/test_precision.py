@@ -0,0 +1,58 @@
+"""Stored point times must not depend on the write precision"""
+import os
+import sys
+
+os.environ.setdefault('JENKINS_URL', 'http://jenkins.example')
+os.environ.setdefault('JENKINS_USER', 'user')
+os.environ.setdefault('JENKINS_TOKEN', 'token')
+os.environ.setdefault('INFLUX_URL', 'http://influx.example:8086')
+os.environ.setdefault('INFLUX_DB', 'jenkins')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from two_jenkins_to_influx import INFLUX_PRECISION_NS, InfluxBatchWriter, JenkinsInfluxCollector, LineProtocolEncoder
+
+TIMESTAMP_MS = 1700000300703
+
+
+def encode(precision):
+    encoder = LineProtocolEncoder('builds', 'local', precision)
+    return encoder.encode('job', 'team/job', 'all', 5, 5000, 'SUCCESS', 'Alice Smith', TIMESTAMP_MS).decode('utf-8')
+
+
+def stored_time_ns(line, precision):
+    """Time InfluxDB stores for a line written with ?precision=<precision>"""
+    return int(line.rsplit(' ', 1)[1]) * INFLUX_PRECISION_NS[precision]
+
+
+@pytest.mark.parametrize('precision', ['ms', 'u', 'ns'])
+def test_stored_time_is_the_same_for_every_precision(precision):
+    assert stored_time_ns(encode(precision), precision) == TIMESTAMP_MS * 1_000_000
+
+
+def test_only_the_timestamp_differs_between_precisions():
+    lines = {precision: encode(precision) for precision in INFLUX_PRECISION_NS}
+    assert lines['ms'].endswith(f" {TIMESTAMP_MS}")
+    assert len({line.rsplit(' ', 1)[0] for line in lines.values()}) == 1
+
+
+@pytest.mark.parametrize('precision', ['ms', 'u', 'ns'])
+def test_writer_precision_reaches_the_encoder_and_write_endpoint(precision):
+    sent = []
+    writer = InfluxBatchWriter(lambda payload, precision: sent.append(precision) or True, precision=precision)
+    collector = JenkinsInfluxCollector(writer=writer)
+    assert collector.encoder.precision == precision
+    assert f"precision={precision}" in collector.write_endpoint()
+
+    payload, _ = collector.format_build_point('job', 'team/job', 'all', {
+        'number': 5, 'timestamp': TIMESTAMP_MS, 'duration': 5000, 'result': 'SUCCESS', 'user_info': 'Alice Smith'})
+    writer.add(payload)
+    writer.flush()
+    assert sent == [precision]
+    assert stored_time_ns(payload.decode('utf-8'), sent[0]) == TIMESTAMP_MS * 1_000_000
+
+
+def test_unknown_writer_precision_is_rejected():
+    with pytest.raises(ValueError):
+        InfluxBatchWriter(lambda payload, precision: True, precision='s')
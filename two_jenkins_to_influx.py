@@ -1,13 +1,46 @@
 #!/usr/bin/env python3
 
 import requests
+import asyncio
+import gzip
+import hashlib
+import heapq
 import json
+import signal
 import sys
 import os
+import random
 import urllib.parse
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import logging
+import queue
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:  # only needed for COLLECTOR_ENGINE=async
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # optional, faster decoding of large Jenkins responses
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional, lets backfill parse allBuilds pages as they arrive
+    ijson = None
+
+# Decoder for Jenkins and InfluxDB responses; both accept bytes or str
+json_loads = orjson.loads if orjson else json.loads
 
 # =========================
 # CONFIGURATION
@@ -21,6 +54,126 @@ INFLUX_URL = os.getenv('INFLUX_URL')
 INFLUX_DB = os.getenv('INFLUX_DB')
 MEASUREMENT = os.getenv('MEASUREMENT')
 
+# Folder levels (folders, organization folders, multibranch projects) returned inline by
+# each discovery request; deeper levels cost one extra request per folder at the limit
+FOLDER_DEPTH = max(0, int(os.getenv('FOLDER_DEPTH', '3')))
+
+# Job fields fetched during discovery; lastBuild, lastCompletedBuild and nextBuildNumber
+# are compared with the recorded state so unchanged jobs are skipped without a listing
+JOB_FIELDS = 'name,fullName,url,_class,lastBuild[number],lastCompletedBuild[number],nextBuildNumber'
+JOB_TREE = JOB_FIELDS
+for _ in range(FOLDER_DEPTH):
+    JOB_TREE = f'{JOB_FIELDS},jobs[{JOB_TREE}]'
+
+# Discovery returns every view with its jobs in one request
+VIEWS_TREE = f'views[name,url,_class,jobs[{JOB_TREE}]]'
+
+# Build fields fetched in the job listing; the user causes come along so no per-build request is needed
+BUILD_FIELDS = 'number,timestamp,duration,result,url,actions[causes[userId,userName,shortDescription]]'
+BUILD_TREE = f'builds[{BUILD_FIELDS}]'
+
+# Points are buffered and written in batches, flushed on whichever limit is hit first
+INFLUX_BATCH_SIZE = int(os.getenv('INFLUX_BATCH_SIZE', '5000'))
+INFLUX_BATCH_BYTES = int(os.getenv('INFLUX_BATCH_BYTES', str(1024 * 1024)))
+
+# Keep-alive connections to InfluxDB shared by all workers
+INFLUX_POOL_SIZE = max(1, int(os.getenv('INFLUX_POOL_SIZE', '10')))
+
+# Jenkins and InfluxDB requests failing with a connection error, a timeout or one of
+# RETRY_STATUSES are tried up to RETRY_ATTEMPTS times, with exponential backoff and full
+# jitter capped at RETRY_MAX_BACKOFF seconds; a Retry-After header overrides the backoff.
+# InfluxDB writes are idempotent, so POSTs are retried too
+RETRY_ATTEMPTS = max(1, int(os.getenv('RETRY_ATTEMPTS', '4')))
+RETRY_BACKOFF = float(os.getenv('RETRY_BACKOFF', '0.5'))
+RETRY_MAX_BACKOFF = float(os.getenv('RETRY_MAX_BACKOFF', '30'))
+RETRY_STATUSES = frozenset(int(code) for code in os.getenv('RETRY_STATUSES', '429,500,502,503,504').split(',')
+                           if code.strip())
+
+# After CIRCUIT_BREAKER_FAILURES consecutive failed requests a server gets no requests for
+# CIRCUIT_BREAKER_RESET seconds, then a single trial request decides whether to resume
+CIRCUIT_BREAKER_FAILURES = max(1, int(os.getenv('CIRCUIT_BREAKER_FAILURES', '5')))
+CIRCUIT_BREAKER_RESET = float(os.getenv('CIRCUIT_BREAKER_RESET', '60'))
+
+# Batches are sent gzip-compressed (Content-Encoding: gzip) at this level, 0 sends plain text
+INFLUX_GZIP_LEVEL = min(9, max(0, int(os.getenv('INFLUX_GZIP_LEVEL', '6'))))
+
+# Timestamp precision of written points: 'ms' sends Jenkins' millisecond timestamps as
+# they are, 'u' and 'ns' scale them up. Stored times are the same either way
+INFLUX_PRECISION = os.getenv('INFLUX_PRECISION', 'ms').lower()
+INFLUX_PRECISION_NS = {'ms': 1_000_000, 'u': 1_000, 'ns': 1}
+
+# Points waiting for the background writer thread; workers block once it is full so
+# scraping never runs ahead of InfluxDB. 0 writes from the worker threads directly
+INFLUX_QUEUE_SIZE = max(0, int(os.getenv('INFLUX_QUEUE_SIZE', '10000')))
+
+# How already-inserted builds are detected: 'view' loads the stored build numbers of a
+# view from its oldest listed build onwards, shared by the view's jobs, 'job' does one
+# query per job covering all of its views, 'build' one query per build. 'none' skips the
+# check and rewrites every listed build; a point with the same tags and timestamp
+# overwrites the stored one, so this is harmless
+DEDUP_MODE = os.getenv('DEDUP_MODE', 'view').lower()
+DEDUP_MODES = ('view', 'job', 'build', 'none')
+
+# Optional JSON file of digests of the points already written, so unchanged points
+# are not sent again (mostly useful with DEDUP_MODE=none)
+WRITTEN_POINTS_FILE = os.getenv('WRITTEN_POINTS_FILE', '')
+# Seconds between rewrites of WRITTEN_POINTS_FILE in daemon mode; runs write it once at the end
+WRITTEN_POINTS_SAVE_INTERVAL = float(os.getenv('WRITTEN_POINTS_SAVE_INTERVAL', '300'))
+
+# Optional JSON file remembering per-job high-water marks so unchanged jobs are skipped
+STATE_FILE = os.getenv('STATE_FILE', '')
+
+# Measurement receiving the collector's own metrics (discovery time, request counts)
+COLLECTOR_METRICS_MEASUREMENT = os.getenv('COLLECTOR_METRICS_MEASUREMENT', 'jenkins_collector')
+
+# Number of jobs scraped concurrently; also the bound on parallel requests to the controller
+COLLECTOR_WORKERS = max(1, int(os.getenv('COLLECTOR_WORKERS', '4')))
+
+# Client-side limits protecting each Jenkins controller: JENKINS_MAX_RPS requests per second
+# from a token bucket holding up to JENKINS_BURST tokens (0 = unlimited), and at most
+# JENKINS_MAX_IN_FLIGHT concurrent requests (0 = bounded by the workers only). With
+# JENKINS_ADAPTIVE_RATE the rate backs off while the average response time is above
+# JENKINS_LATENCY_TARGET seconds and climbs back to JENKINS_MAX_RPS once it is below
+JENKINS_MAX_RPS = max(0.0, float(os.getenv('JENKINS_MAX_RPS', '0')))
+JENKINS_BURST = max(1, int(os.getenv('JENKINS_BURST', '5')))
+JENKINS_MAX_IN_FLIGHT = max(0, int(os.getenv('JENKINS_MAX_IN_FLIGHT', '0')))
+JENKINS_ADAPTIVE_RATE = os.getenv('JENKINS_ADAPTIVE_RATE', 'false').lower() in ('1', 'true', 'yes')
+JENKINS_LATENCY_TARGET = float(os.getenv('JENKINS_LATENCY_TARGET', '1.0'))
+
+# Optional JSON file listing several Jenkins instances to scrape concurrently in one process,
+# instead of JENKINS_URL/JENKINS_INSTANCE:
+#   {"instances": [{"name": "ec2-server", "url": "https://...", "user_env": "EC2_JENKINS_USER",
+#                   "token_env": "EC2_JENKINS_TOKEN", "workers": 4, "max_rps": 10, "max_in_flight": 4}]}
+# Credentials are read from the named environment variables (default JENKINS_USER/JENKINS_TOKEN)
+COLLECTOR_CONFIG = os.getenv('COLLECTOR_CONFIG', '')
+
+# 'run' scrapes the builds Jenkins lists for each job (latest ~100); 'backfill' pages through
+# allBuilds in BACKFILL_PAGE_SIZE ranges, checkpointing progress in BACKFILL_STATE_FILE
+COLLECTOR_MODE = os.getenv('COLLECTOR_MODE', 'run').lower()
+BACKFILL_PAGE_SIZE = max(1, int(os.getenv('BACKFILL_PAGE_SIZE', '100')))
+BACKFILL_STATE_FILE = os.getenv('BACKFILL_STATE_FILE', 'backfill_state.json')
+
+# Optional on-disk cache of Jenkins responses: finished build records are reused without a
+# request, responses carrying an ETag or Last-Modified are revalidated with a conditional
+# request. The least recently used entries beyond HTTP_CACHE_MAX_ENTRIES are evicted
+HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', '')
+HTTP_CACHE_MAX_ENTRIES = max(1, int(os.getenv('HTTP_CACHE_MAX_ENTRIES', '10000')))
+
+# 'threads' (default) or 'async', which needs aiohttp and scrapes with many requests in flight
+COLLECTOR_ENGINE = os.getenv('COLLECTOR_ENGINE', 'threads').lower()
+ASYNC_MAX_REQUESTS = max(1, int(os.getenv('ASYNC_MAX_REQUESTS', '200')))
+ASYNC_LIMIT_PER_HOST = max(1, int(os.getenv('ASYNC_LIMIT_PER_HOST', '50')))
+
+# With --daemon the collector stays resident, rediscovering views every DISCOVERY_INTERVAL
+# seconds and polling jobs in between. Jobs that build often are polled every
+# POLL_MIN_INTERVAL (default POLL_INTERVAL) seconds, idle jobs back off exponentially up to
+# POLL_MAX_INTERVAL. Before each poll the due jobs' views are probed with one request per view,
+# and discovery polls a job right away when its builds changed
+DISCOVERY_INTERVAL = max(1, int(os.getenv('DISCOVERY_INTERVAL', '600')))
+POLL_INTERVAL = max(1, int(os.getenv('POLL_INTERVAL', '30')))
+POLL_MIN_INTERVAL = max(1, int(os.getenv('POLL_MIN_INTERVAL', str(POLL_INTERVAL))))
+POLL_MAX_INTERVAL = max(POLL_MIN_INTERVAL, int(os.getenv('POLL_MAX_INTERVAL', '3600')))
+
 # =========================
 # LOGGING SETUP
 # =========================
@@ -30,30 +183,722 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Set on SIGTERM/SIGINT; a daemon collector stops after its current cycle
+shutdown = threading.Event()
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the server's circuit breaker is open"""
+
+class CircuitBreaker:
+    """Stops requests to a server after repeated failures, letting one trial through after a pause"""
+
+    def __init__(self, name, failures=CIRCUIT_BREAKER_FAILURES, reset_after=CIRCUIT_BREAKER_RESET):
+        self.name = name
+        self.failures = failures
+        self.reset_after = reset_after
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_running or time.monotonic() - self.opened_at < self.reset_after:
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            if self.opened_at is not None:
+                logger.info(f"{self.name} is responding again, resuming requests")
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.consecutive_failures += 1
+            self.trial_running = False
+            if self.opened_at is not None or self.consecutive_failures >= self.failures:
+                if self.opened_at is None:
+                    logger.error(f"{self.name} failed {self.consecutive_failures} requests in a row, "
+                                 f"pausing requests for {self.reset_after:.0f}s")
+                self.opened_at = time.monotonic()
+
+    def check(self):
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} looks down, request not sent")
+
+class RetryPolicy:
+    """Retries failed requests with exponential backoff and full jitter, honouring Retry-After"""
+
+    def __init__(self, attempts=RETRY_ATTEMPTS, backoff=RETRY_BACKOFF, max_backoff=RETRY_MAX_BACKOFF,
+                 statuses=RETRY_STATUSES):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to wait before retrying after the given (1-based) attempt"""
+        seconds = self.parse_retry_after(retry_after)
+        if seconds is None:
+            seconds = random.uniform(0, self.backoff * 2 ** (attempt - 1))
+        return min(seconds, self.max_backoff)
+
+    def parse_retry_after(self, value):
+        """Retry-After as seconds; it may also be an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def call(self, send, breaker):
+        """Run send() until it returns a response not worth retrying; the last response is returned
+        even if it failed, connection errors are re-raised once attempts run out"""
+        breaker.check()
+        for attempt in range(1, self.attempts + 1):
+            try:
+                response = send()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == self.attempts:
+                    breaker.record_failure()
+                    raise
+                logger.warning(f"Request failed ({e}), retry {attempt} of {self.attempts - 1}")
+                retry_after = None
+            except requests.exceptions.RequestException:
+                # Not transient (e.g. an invalid URL), no point retrying
+                breaker.record_failure()
+                raise
+            else:
+                if response.status_code not in self.statuses:
+                    breaker.record_success()
+                    return response
+                if attempt == self.attempts:
+                    breaker.record_failure()
+                    return response
+                logger.warning(f"{response.status_code} from {response.url}, retry {attempt} of {self.attempts - 1}")
+                retry_after = response.headers.get('Retry-After')
+                # Hands the connection of a streamed response back to the pool
+                response.close()
+            time.sleep(self.delay(attempt, retry_after))
+
+    async def call_async(self, send, breaker):
+        """call() for the asyncio engine: send is a coroutine function returning an aiohttp
+        response and its body, read before the response is released"""
+        breaker.check()
+        for attempt in range(1, self.attempts + 1):
+            try:
+                response, body = await send()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == self.attempts:
+                    breaker.record_failure()
+                    raise
+                logger.warning(f"Request failed ({e!r}), retry {attempt} of {self.attempts - 1}")
+                retry_after = None
+            except aiohttp.ClientError:
+                breaker.record_failure()
+                raise
+            else:
+                if response.status not in self.statuses:
+                    breaker.record_success()
+                    return response, body
+                if attempt == self.attempts:
+                    breaker.record_failure()
+                    return response, body
+                logger.warning(f"{response.status} from {response.url}, retry {attempt} of {self.attempts - 1}")
+                retry_after = response.headers.get('Retry-After')
+            await asyncio.sleep(self.delay(attempt, retry_after))
+
+class RateLimiter:
+    """Token bucket pacing requests to one Jenkins instance, with an optional cap on requests in flight.
+
+    In adaptive mode the rate is cut by a fifth whenever the latency average is above
+    the target and raised by a twentieth of the maximum while it is below.
+    """
+
+    def __init__(self, max_rate=JENKINS_MAX_RPS, burst=JENKINS_BURST, max_in_flight=JENKINS_MAX_IN_FLIGHT,
+                 adaptive=JENKINS_ADAPTIVE_RATE, latency_target=JENKINS_LATENCY_TARGET):
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.max_in_flight = max_in_flight
+        self.in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight else None
+        self.adaptive = adaptive and max_rate > 0
+        self.latency_target = latency_target
+        self.latency = None
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, returns the seconds to wait before sending the request"""
+        with self.lock:
+            if not self.rate:
+                return 0.0
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def acquire(self):
+        time.sleep(self.reserve())
+        if self.in_flight:
+            self.in_flight.acquire()
+
+    def release(self, latency):
+        if self.in_flight:
+            self.in_flight.release()
+        self.observe(latency)
+
+    def observe(self, latency):
+        """Feed a response time into the latency average and adapt the rate"""
+        if not self.adaptive:
+            return
+        with self.lock:
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            if self.latency > self.latency_target:
+                rate = max(self.max_rate / 10, self.rate * 0.8)
+            else:
+                rate = min(self.max_rate, self.rate + self.max_rate / 20)
+            if rate < self.rate == self.max_rate:
+                logger.warning(f"Jenkins responses take {self.latency:.2f}s on average, reducing the request rate")
+            elif rate == self.max_rate > self.rate:
+                logger.info(f"Jenkins latency back to {self.latency:.2f}s, request rate restored to {rate:.2f}/s")
+            self.rate = rate
+
+# There is one InfluxDB per process, so every collector shares its breaker
+influx_breaker = CircuitBreaker('InfluxDB')
+
+class LineProtocolEncoder:
+    """Encodes build points as UTF-8 line protocol, caching the tag prefix of each series
+    and the escaped form of repeated field values such as results and user names"""
+
+    def __init__(self, measurement, server, precision=INFLUX_PRECISION):
+        self.measurement = measurement
+        self.server = server
+        self.precision = precision
+        # Jenkins timestamps are in ms
+        self.ms_scale = INFLUX_PRECISION_NS['ms'] // INFLUX_PRECISION_NS[precision]
+        # (job, view) -> 'measurement,project_name=...,server=... '
+        self.prefixes = {}
+        self.escaped = {}
+        # Local UTC offset per hour (None when it changes within the hour) and date strings per day
+        self.utc_offsets = {}
+        self.dates = {}
+
+    def escape(self, value):
+        if value is None:
+            return ""
+        value = str(value)
+        if ' ' in value or ',' in value or '=' in value or '"' in value:
+            return value.replace(' ', '\\ ').replace(',', '\\,').replace('=', '\\=').replace('"', '\\"')
+        return value
+
+    def escape_cached(self, value):
+        escaped = self.escaped.get(value)
+        if escaped is None:
+            if len(self.escaped) >= 10000:
+                self.escaped.clear()
+            escaped = self.escaped[value] = self.escape(value)
+        return escaped
+
+    def series_prefix(self, project_name, project_path, view_name):
+        key = (project_name, project_path, view_name)
+        prefix = self.prefixes.get(key)
+        if prefix is None:
+            prefix = (f"{self.measurement},"
+                      f"project_name={self.escape(project_name)},"
+                      f"project_path={self.escape(project_path)},"
+                      f"view={self.escape(view_name)},"
+                      f"server={self.escape(self.server)} ")
+            self.prefixes[key] = prefix
+        return prefix
+
+    def build_time(self, timestamp_ms):
+        """Local time of a ms timestamp as '%Y-%m-%dT%H:%M:%S.%fZ', like datetime.fromtimestamp().
+
+        localtime() and strftime() only run once per hour and day of builds; within an
+        hour with a fixed UTC offset the clock time is plain arithmetic.
+        """
+        seconds, ms = divmod(timestamp_ms, 1000)
+        hour = seconds // 3600
+        if hour not in self.utc_offsets:
+            if len(self.utc_offsets) >= 100000:
+                self.utc_offsets.clear()
+                self.dates.clear()
+            start, end = time.localtime(hour * 3600), time.localtime(hour * 3600 + 3599)
+            self.utc_offsets[hour] = start.tm_gmtoff if start.tm_gmtoff == end.tm_gmtoff else None
+        offset = self.utc_offsets[hour]
+        if offset is None:
+            return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconds))}.{ms:03d}000Z"
+        day, second = divmod(seconds + offset, 86400)
+        date = self.dates.get(day)
+        if date is None:
+            date = self.dates[day] = time.strftime('%Y-%m-%d', time.gmtime(day * 86400))
+        hours, second = divmod(second, 3600)
+        minutes, second = divmod(second, 60)
+        return f"{date}T{hours:02d}:{minutes:02d}:{second:02d}.{ms:03d}000Z"
+
+    def encode(self, project_name, project_path, view_name, build_number, build_duration, build_result,
+               user_name, timestamp_ms):
+        return (f"{self.series_prefix(project_name, project_path, view_name)}"
+                f"build_number={build_number}i,"
+                f"build_duration={build_duration}i,"
+                f"build_result=\"{self.escape_cached(build_result)}\","
+                f"build_time=\"{self.build_time(timestamp_ms)}\","
+                f"user_name=\"{self.escape_cached(user_name)}\" "
+                f"{timestamp_ms * self.ms_scale}").encode('utf-8')
+
+class InfluxBatchWriter:
+    """Buffers encoded line-protocol points and writes them to InfluxDB in batches"""
+
+    def __init__(self, send, max_lines=INFLUX_BATCH_SIZE, max_bytes=INFLUX_BATCH_BYTES, precision=INFLUX_PRECISION):
+        # send(payload, precision) posts one batch of bytes and returns True when InfluxDB accepted it
+        if precision not in INFLUX_PRECISION_NS:
+            raise ValueError(f"Unknown InfluxDB precision '{precision}', expected one of {', '.join(INFLUX_PRECISION_NS)}")
+        self.send = send
+        # Timestamp precision of the points added to this writer
+        self.precision = precision
+        self.max_lines = max(1, max_lines)
+        self.max_bytes = max(1, max_bytes)
+        # Points are appended newline-separated to a buffer that is handed over as the batch
+        self.buffer = bytearray()
+        self.count = 0
+        self.labels = []
+        self.keys = []
+        self.written = 0
+        self.failed = 0
+        # Points keyed (group, item), e.g. (server, job), are also counted per group
+        self.written_by = Counter()
+        self.failed_by = Counter()
+        # Keys that had at least one point in a failed batch
+        self.failed_keys = set()
+        # Worker threads share one writer
+        self.lock = threading.RLock()
+
+    def add(self, line, label=None, key=None):
+        with self.lock:
+            if self.count and len(self.buffer) + len(line) + 1 > self.max_bytes:
+                self.flush()
+            self._append(line, label, key)
+            if self.count >= self.max_lines:
+                self.flush()
+
+    def flush(self):
+        """Write all buffered points as one batch, returns False if the batch failed"""
+        with self.lock:
+            batch = self._take_batch()
+            if batch is None:
+                return True
+            payload, count, labels, keys = batch
+            return self._record_batch(self.send(payload, self.precision), count, labels, keys)
+
+    def take_failed_keys(self, group):
+        """Remove and return the failed keys of one group, so a later failure-free
+        cycle of a long-running collector can save those jobs again"""
+        with self.lock:
+            keys = {key for key in self.failed_keys if key[0] == group}
+            self.failed_keys -= keys
+            return keys
+
+    def _append(self, line, label, key):
+        if self.count:
+            self.buffer += b'\n'
+        self.buffer += line
+        self.count += 1
+        self.labels.append(label)
+        self.keys.append(key)
+
+    def _take_batch(self):
+        if not self.count:
+            return None
+        batch = (self.buffer, self.count, self.labels, self.keys)
+        self.buffer, self.count, self.labels, self.keys = bytearray(), 0, [], []
+        return batch
+
+    def _record_batch(self, ok, count, labels, keys):
+        groups = Counter(key[0] for key in keys if key is not None)
+        if ok:
+            self.written += count
+            self.written_by.update(groups)
+            logger.info(f"Wrote batch of {count} point(s) to InfluxDB")
+            for label in labels:
+                if label:
+                    logger.info(f" {label}")
+            return True
+
+        self.failed += count
+        self.failed_by.update(groups)
+        self.failed_keys.update(key for key in keys if key is not None)
+        logger.error(f"Failed to write batch of {count} point(s) to InfluxDB")
+        for label in labels:
+            if label:
+                logger.error(f" Failed to insert {label}")
+        return False
+
+class AsyncInfluxBatchWriter(InfluxBatchWriter):
+    """InfluxBatchWriter for the asyncio engine, `send` is a coroutine function"""
+
+    async def add(self, line, label=None, key=None):
+        if self.count and len(self.buffer) + len(line) + 1 > self.max_bytes:
+            await self.flush()
+        self._append(line, label, key)
+        if self.count >= self.max_lines:
+            await self.flush()
+
+    async def flush(self):
+        # The buffer is swapped out before awaiting so other tasks keep appending to a fresh one
+        batch = self._take_batch()
+        if batch is None:
+            return True
+        payload, count, labels, keys = batch
+        return self._record_batch(await self.send(payload, self.precision), count, labels, keys)
+
+class QueuedInfluxWriter:
+    """Feeds an InfluxBatchWriter from a bounded queue on a background thread.
+
+    Workers hand points over and go back to scraping while batches are written;
+    add() blocks once `maxsize` points are waiting.
+    """
+
+    def __init__(self, writer, maxsize=INFLUX_QUEUE_SIZE):
+        self.writer = writer
+        self.queue = queue.Queue(maxsize)
+        self.thread = threading.Thread(target=self._run, name='influx-writer', daemon=True)
+        self.thread.start()
+
+    @property
+    def written(self):
+        return self.writer.written
+
+    @property
+    def failed(self):
+        return self.writer.failed
+
+    @property
+    def failed_keys(self):
+        return self.writer.failed_keys
+
+    @property
+    def precision(self):
+        return self.writer.precision
+
+    @property
+    def written_by(self):
+        return self.writer.written_by
+
+    @property
+    def failed_by(self):
+        return self.writer.failed_by
+
+    def take_failed_keys(self, group):
+        return self.writer.take_failed_keys(group)
+
+    def add(self, line, label=None, key=None):
+        self.queue.put((line, label, key))
+
+    def flush(self):
+        """Wait until every point queued so far has been written"""
+        flushed = threading.Event()
+        self.queue.put(flushed)
+        flushed.wait()
+        return True
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if isinstance(item, threading.Event):
+                    self.writer.flush()
+                    item.set()
+                else:
+                    self.writer.add(*item)
+            except Exception as e:
+                # Keep draining, a dead writer thread would block every worker
+                logger.error(f"Error writing to InfluxDB: {e}")
+                if isinstance(item, threading.Event):
+                    item.set()
+
+class JobStateStore:
+    """Per-job progress persisted between runs, keyed by server and job fullName.
+
+    For incremental runs an entry holds 'recorded', the highest build number up to
+    which every build is finished and stored in InfluxDB, plus the 'last_build',
+    'last_completed' and 'next_build' numbers Jenkins reported and the sorted 'views' the job
+    was in. Backfill checkpoints hold the next allBuilds
+    offset ('next') and whether the job's history is complete ('done').
+    Without a path the entries are only kept in memory.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.data = {}
+        self.pending = {}
+        # Backfill workers checkpoint concurrently
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read state file {path}, starting from scratch: {e}")
+
+    def get(self, server, job_full_name):
+        return self.data.get(server, {}).get(job_full_name)
+
+    def update(self, server, job_full_name, **entry):
+        # Applied on save() so every view of a run compares against the previous run
+        with self.lock:
+            self.pending[(server, job_full_name)] = entry
+
+    def save(self, failed_keys=(), server=None):
+        """Persist pending entries, dropping (server, job) keys whose points were not written.
+
+        With `server` only that server's entries are applied, others stay pending.
+        """
+        with self.lock:
+            for key, entry in list(self.pending.items()):
+                if server is not None and key[0] != server:
+                    continue
+                del self.pending[key]
+                if key not in failed_keys:
+                    self.data.setdefault(key[0], {})[key[1]] = entry
+            if not self.path:
+                return
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.data, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.error(f"Could not write state file {self.path}: {e}")
+
+class WrittenPointStore:
+    """Digests of the points written to InfluxDB, keyed by server and job fullName.
+
+    A point is only sent again when its encoded line changed. A job's digests are
+    replaced by those of the builds it listed this time, so builds Jenkins no longer
+    lists are forgotten. Jobs with a failed write keep their previous digests, so
+    their points are retried next time.
+    """
+
+    def __init__(self, path, save_interval=WRITTEN_POINTS_SAVE_INTERVAL):
+        self.path = path
+        self.save_interval = save_interval
+        self.data = {}
+        self.pending = {}
+        self.dirty = False
+        self.saved_at = time.monotonic()
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.data = {server: {job: set(digests) for job, digests in jobs.items()}
+                                 for server, jobs in json.load(f).items()}
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"Could not read written points file {path}, starting from scratch: {e}")
+
+    def seen(self, key, line):
+        """True if this (server, job) point was written before; either way it is kept on save()"""
+        digest = hashlib.blake2b(line, digest_size=8).hexdigest()
+        with self.lock:
+            pending = self.pending.setdefault(key, set())
+            known = digest in pending or digest in self.data.get(key[0], {}).get(key[1], ())
+            pending.add(digest)
+            return known
+
+    def save(self, failed_keys=(), server=None, final=True):
+        """Apply pending digests, dropping (server, job) keys whose points were not written.
+
+        The file is only rewritten when something changed, and unless `final` at most
+        once per save_interval.
+        """
+        with self.lock:
+            for key, digests in list(self.pending.items()):
+                if server is not None and key[0] != server:
+                    continue
+                del self.pending[key]
+                if key not in failed_keys:
+                    self.data.setdefault(key[0], {})[key[1]] = digests
+                    self.dirty = True
+            if not self.path or not self.dirty:
+                return
+            if not final and time.monotonic() - self.saved_at < self.save_interval:
+                return
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump({server: {job: list(digests) for job, digests in jobs.items()}
+                               for server, jobs in self.data.items()}, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+                self.saved_at = time.monotonic()
+            except OSError as e:
+                logger.error(f"Could not write written points file {self.path}: {e}")
+
+class JenkinsResponseCache:
+    """Jenkins API responses cached on disk, one JSON file per URL, evicted least recently used first.
+
+    Finished builds never change and are served without a request; other responses
+    are only kept when Jenkins sent a validator (ETag/Last-Modified) to revalidate them.
+    """
+
+    def __init__(self, directory, max_entries=HTTP_CACHE_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.revalidated = 0
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        # File names in LRU order; the mtime carries the order over to the next run
+        files = sorted((entry for entry in os.scandir(directory) if entry.name.endswith('.json')),
+                       key=lambda entry: entry.stat().st_mtime)
+        self.entries = OrderedDict.fromkeys(entry.name for entry in files)
+
+    def file_name(self, url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json'
+
+    def get(self, url):
+        """Cached entry for a URL: 'data', plus 'immutable' or the validators to send"""
+        name = self.file_name(url)
+        with self.lock:
+            if name not in self.entries:
+                return None
+            self.entries.move_to_end(name)
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self.lock:
+                self.entries.pop(name, None)
+            return None
+        return entry if entry.get('url') == url else None
+
+    def put(self, url, data, headers):
+        if self.is_finished_build(data):
+            entry = {'url': url, 'data': data, 'immutable': True}
+        elif headers.get('ETag') or headers.get('Last-Modified'):
+            entry = {'url': url, 'data': data, 'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+        else:
+            return
+        name = self.file_name(url)
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write HTTP cache entry for {url}: {e}")
+            return
+        with self.lock:
+            self.entries[name] = None
+            self.entries.move_to_end(name)
+            evicted = [self.entries.popitem(last=False)[0] for _ in range(len(self.entries) - self.max_entries)]
+        for name in evicted:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def is_finished_build(self, data):
+        return isinstance(data, dict) and 'number' in data and data.get('result') is not None \
+            and not data.get('building', False)
+
+    def validators(self, entry):
+        """Conditional request headers for a cached entry"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+def new_influx_session():
+    """Pooled keep-alive session for InfluxDB; retries are left to the RetryPolicy"""
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=INFLUX_POOL_SIZE)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
 class JenkinsInfluxCollector:
-    def __init__(self):
+    def __init__(self, jenkins_url=JENKINS_URL, jenkins_user=JENKINS_USER, jenkins_token=JENKINS_TOKEN,
+                 jenkins_instance=JENKINS_INSTANCE, workers=COLLECTOR_WORKERS, writer=None, state=None,
+                 backfill_state=None, http_cache=None, influx_session=None, max_rps=JENKINS_MAX_RPS,
+                 max_in_flight=JENKINS_MAX_IN_FLIGHT, written_points=None):
+        """Defaults come from the environment; writer, state stores, HTTP cache and InfluxDB
+        session can be shared between instances"""
         # Validate required environment variables
-        if not JENKINS_USER:
+        if not jenkins_user:
             logger.error("JENKINS_USER environment variable is required but not set")
             sys.exit(1)
-        if not JENKINS_TOKEN:
+        if not jenkins_token:
             logger.error("JENKINS_TOKEN environment variable is required but not set")
             sys.exit(1)
-        if not JENKINS_URL:
+        if not jenkins_url:
             logger.error("JENKINS_URL environment variable is required but not set")
             sys.exit(1)
             
-        self.jenkins_url = JENKINS_URL.rstrip('/')
-        self.jenkins_user = JENKINS_USER
-        self.jenkins_token = JENKINS_TOKEN
-        self.jenkins_instance = JENKINS_INSTANCE
+        self.jenkins_url = jenkins_url.rstrip('/')
+        self.jenkins_user = jenkins_user
+        self.jenkins_token = jenkins_token
+        self.jenkins_instance = jenkins_instance
         self.influx_url = INFLUX_URL.rstrip('/')
         self.influx_db = INFLUX_DB
         self.measurement = MEASUREMENT
+        if INFLUX_PRECISION not in INFLUX_PRECISION_NS:
+            logger.error(f"INFLUX_PRECISION must be one of {', '.join(INFLUX_PRECISION_NS)}, got '{INFLUX_PRECISION}'")
+            sys.exit(1)
+        if DEDUP_MODE not in DEDUP_MODES:
+            logger.error(f"DEDUP_MODE must be one of {', '.join(DEDUP_MODES)}, got '{DEDUP_MODE}'")
+            sys.exit(1)
         
         self.auth = HTTPBasicAuth(self.jenkins_user, self.jenkins_token)
         self.session = requests.Session()
         self.session.auth = self.auth
+        self.session.headers['Accept-Encoding'] = 'gzip'
+        self.workers = max(1, workers)
+        # One pooled connection per worker so concurrent jobs don't wait for a free socket
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.influx_session = influx_session or new_influx_session()
+        self.retry_policy = RetryPolicy()
+        self.jenkins_breaker = CircuitBreaker(f"Jenkins {self.jenkins_instance}")
+        self.rate_limiter = RateLimiter(max_rate=max_rps, max_in_flight=max_in_flight)
+        if writer is None:
+            writer = InfluxBatchWriter(self.write_points)
+            if INFLUX_QUEUE_SIZE:
+                writer = QueuedInfluxWriter(writer)
+        self.writer = writer
+        # Point timestamps follow the precision of the writer they are sent through
+        self.encoder = LineProtocolEncoder(self.measurement, self.jenkins_instance, writer.precision)
+        self.state = state if state is not None else JobStateStore(STATE_FILE) if STATE_FILE else None
+        self.backfill_state = backfill_state
+        if written_points is None and WRITTEN_POINTS_FILE:
+            written_points = WrittenPointStore(WRITTEN_POINTS_FILE)
+        self.written_points = written_points
+        if http_cache is None and HTTP_CACHE_DIR:
+            http_cache = JenkinsResponseCache(HTTP_CACHE_DIR)
+        self.http_cache = http_cache
+        # Newest build timestamp, build count and running flag of each job's last listing
+        self.job_activity = {}
+        self.dedup_lock = threading.Lock()
+        self.view_inserted = {}
         
         logger.info("=== JENKINS TO INFLUXDB DATA COLLECTOR ===")
         logger.info(f"Jenkins Instance: {self.jenkins_instance}")
@@ -62,11 +907,24 @@ class JenkinsInfluxCollector:
         logger.info(f"InfluxDB URL: {self.influx_url}")
         logger.info(f"Database: {self.influx_db}")
         logger.info(f"Measurement: {self.measurement}")
+        logger.info(f"Workers: {self.workers}")
+        if self.rate_limiter.max_rate or self.rate_limiter.max_in_flight:
+            logger.info(f"Jenkins request limit: {self.rate_limiter.max_rate or 'unlimited'}/s, "
+                        f"{self.rate_limiter.max_in_flight or 'unlimited'} in flight"
+                        f"{' (adaptive)' if self.rate_limiter.adaptive else ''}")
+        if self.state:
+            logger.info(f"State file: {STATE_FILE}")
+        if DEDUP_MODE == 'none':
+            logger.info("Dedup: none, known builds are rewritten in place")
+        if self.written_points:
+            logger.info(f"Written points file: {self.written_points.path}")
+        if self.http_cache:
+            logger.info(f"HTTP cache: {self.http_cache.directory} ({len(self.http_cache.entries)} entries)")
 
     def escape_value(self, value):
         if value is None:
             return ""
-        return str(value).replace(' ', '\\ ').replace(',', '\\,').replace('=', '\\=').replace('"', '\\"')
+        return self.encoder.escape(value)
 
     def escape_influx_query(self, value):
         if value is None:
@@ -75,11 +933,23 @@ class JenkinsInfluxCollector:
 
     def make_jenkins_request(self, endpoint, timeout=30):
         url = f"{self.jenkins_url}{endpoint}"
+        cached = self.http_cache.get(url) if self.http_cache else None
+        if cached and cached.get('immutable'):
+            self.http_cache.hits += 1
+            return cached['data']
         try:
             logger.debug(f"Making request to: {url}")
-            response = self.session.get(url, timeout=timeout)
+            headers = self.http_cache.validators(cached) if cached else None
+            response = self.retry_policy.call(lambda: self.send_jenkins_request(url, timeout, headers),
+                                              self.jenkins_breaker)
+            if response.status_code == 304 and cached:
+                self.http_cache.revalidated += 1
+                return cached['data']
             response.raise_for_status()
-            return response.json()
+            data = json_loads(response.content)
+            if self.http_cache:
+                self.http_cache.put(url, data, response.headers)
+            return data
         except requests.exceptions.HTTPError as e:
             logger.error(f"HTTP Error {response.status_code} for {url}: {e}")
             if response.status_code == 404:
@@ -94,13 +964,51 @@ class JenkinsInfluxCollector:
             logger.error(f"Error parsing JSON from {url}: {e}")
             return None
 
-    def make_influx_request(self, endpoint, data=None, method='GET'):
+    def get_jenkins_array(self, endpoint, array, timeout=60):
+        """Items of one top-level array of a Jenkins response, or None if the request failed.
+
+        With ijson installed the items are parsed while the body streams in, so neither
+        the raw body nor the full document is held at once. Responses are not cached then.
+        """
+        if ijson is None or self.http_cache:
+            data = self.make_jenkins_request(endpoint, timeout)
+            return None if data is None else data.get(array, [])
+        url = f"{self.jenkins_url}{endpoint}"
+        try:
+            logger.debug(f"Streaming request to: {url}")
+            response = self.retry_policy.call(lambda: self.send_jenkins_request(url, timeout, None, stream=True),
+                                              self.jenkins_breaker)
+            with response:
+                response.raise_for_status()
+                # Let urllib3 undo the gzip Content-Encoding
+                response.raw.decode_content = True
+                return list(ijson.items(response.raw, f'{array}.item', use_float=True))
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"HTTP Error {response.status_code} for {url}: {e}")
+            return None
+        except (requests.exceptions.RequestException, Urllib3Error) as e:
+            # Reading response.raw surfaces urllib3's errors rather than requests'
+            logger.error(f"Error making request to {url}: {e}")
+            return None
+        except ijson.JSONError as e:
+            logger.error(f"Error parsing JSON from {url}: {e}")
+            return None
+
+    def send_jenkins_request(self, url, timeout, headers, stream=False):
+        """One GET to Jenkins, paced by the instance's rate limiter"""
+        self.rate_limiter.acquire()
+        started = time.monotonic()
+        try:
+            return self.session.get(url, timeout=timeout, headers=headers, stream=stream)
+        finally:
+            self.rate_limiter.release(time.monotonic() - started)
+
+    def make_influx_request(self, endpoint, data=None, method='GET', headers=None):
         url = f"{self.influx_url}{endpoint}"
         try:
-            if method == 'POST':
-                response = requests.post(url, data=data, timeout=10)
-            else:
-                response = requests.get(url, timeout=10)
+            response = self.retry_policy.call(
+                lambda: self.influx_session.request(method, url, data=data, headers=headers, timeout=10),
+                influx_breaker)
             response.raise_for_status()
             return response
         except requests.exceptions.RequestException as e:
@@ -131,94 +1039,148 @@ class JenkinsInfluxCollector:
         
         return user_name
 
+    def format_build_point(self, project_name, project_path, view_name, build_data):
+        """Encode one build as a line-protocol point, returns (line bytes, log label)"""
+        build_result = build_data.get('result', 'UNKNOWN')
+        build_duration = build_data.get('duration', 0)
+        build_number = build_data['number']
+        user_name = build_data.get('user_info', 'Unknown')
+
+        payload = self.encoder.encode(project_name, project_path, view_name, build_number, build_duration,
+                                      build_result, user_name, build_data['timestamp'])
+        return payload, f"[{self.jenkins_instance}] {project_name} #{build_number} → User: {user_name}"
+
     def insert_build_to_influx(self, project_name, project_path, view_name, build_data):
+        """Queue a build's point; True when queued, None when the same point was written before"""
         try:
-            build_time_ns = build_data['timestamp'] * 1_000_000
-            build_time_str = datetime.fromtimestamp(build_data['timestamp']/1000).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
-
-            build_result = build_data.get('result', 'UNKNOWN')
-            build_duration = build_data.get('duration', 0)
-            build_number = build_data['number']
-            user_name = build_data.get('user_info', 'Unknown')
-
-            # Escape values
-            escaped_project_name = self.escape_value(project_name)
-            escaped_project_path = self.escape_value(project_path)
-            escaped_view_name = self.escape_value(view_name)
-            escaped_build_result = self.escape_value(build_result)
-            escaped_build_time_str = self.escape_value(build_time_str)
-            escaped_user_name = self.escape_value(user_name)
-            escaped_server = self.escape_value(self.jenkins_instance)
-
-            payload = (f"{self.measurement},"
-                       f"project_name={escaped_project_name},"
-                       f"project_path={escaped_project_path},"
-                       f"view={escaped_view_name},"
-                       f"server={escaped_server} "
-                       f"build_number={build_number}i,"
-                       f"build_duration={build_duration}i,"
-                       f"build_result=\"{escaped_build_result}\","
-                       f"build_time=\"{escaped_build_time_str}\","
-                       f"user_name=\"{escaped_user_name}\" "
-                       f"{build_time_ns}")
-
-            response = self.make_influx_request(f"/write?db={self.influx_db}", data=payload, method='POST')
-
-            if response:
-                logger.info(f" [{self.jenkins_instance}] {project_name} #{build_number} → User: {user_name}")
-                return True
-            else:
-                logger.error(f" Failed to insert {project_name} #{build_number}")
-                return False
+            payload, label = self.format_build_point(project_name, project_path, view_name, build_data)
+            key = (self.jenkins_instance, project_path)
+            if self.written_points and self.written_points.seen(key, payload):
+                return None
+            self.writer.add(payload, label, key=key)
+            return True
         except Exception as e:
             logger.error(f"Error inserting build into InfluxDB: {e}")
             return False
 
-    def get_job_builds(self, job_name, job_full_name):
-        """Get builds for a specific job - handles both simple and folder jobs"""
+    def encode_write_body(self, payload):
+        """Request body and headers for a /write batch, gzipped unless INFLUX_GZIP_LEVEL is 0"""
+        if not INFLUX_GZIP_LEVEL:
+            # Batches are bytearrays, which requests would treat as a stream
+            return bytes(payload), None
+        return gzip.compress(payload, compresslevel=INFLUX_GZIP_LEVEL), {'Content-Encoding': 'gzip'}
+
+    def write_endpoint(self, precision=None):
+        return f"/write?db={self.influx_db}&precision={precision or self.encoder.precision}"
+
+    def write_points(self, payload, precision=None):
+        """POST one batch of line-protocol points to InfluxDB"""
+        data, headers = self.encode_write_body(payload)
+        response = self.make_influx_request(self.write_endpoint(precision), data=data, method='POST',
+                                            headers=headers)
+        return response is not None
+
+    def job_endpoint(self, job_full_name):
+        """API path of a job - handles both simple and folder jobs"""
         # URL encode the job path for folder-based jobs
-        encoded_job_path = '/job/'.join(urllib.parse.quote(part, safe='') for part in job_full_name.split('/'))
-        endpoint = f"/job/{encoded_job_path}/api/json?tree=builds[number,timestamp,duration,result,url]"
-        
+        return '/job/' + '/job/'.join(urllib.parse.quote(part, safe='') for part in job_full_name.split('/'))
+
+    def job_builds_endpoint(self, job_full_name, limit=None):
+        build_range = f"{{0,{limit}}}" if limit else ""
+        return f"{self.job_endpoint(job_full_name)}/api/json?tree={BUILD_TREE}{build_range}"
+
+    def select_builds(self, job_name, job_data, after=0):
+        """Builds of a job listing numbered above `after`"""
+        builds = job_data.get('builds', [])
+        if after:
+            builds = [build for build in builds if build['number'] > after]
+        logger.info(f"Found {len(builds)} builds for job: {job_name}")
+        return builds
+
+    def detail_build(self, build, build_details=None):
+        """Build record used for the point; details come from the listing unless fetched separately"""
+        if build_details is None:
+            # User causes came with the listing
+            return {
+                'number': build['number'],
+                'timestamp': build.get('timestamp', 0),
+                'duration': build.get('duration', 0),
+                'result': build.get('result', 'UNKNOWN'),
+                'url': build.get('url', ''),
+                'user_info': self.extract_user_info(build)
+            }
+        if not build_details:
+            build['user_info'] = 'Unknown'
+            return build
+        return {
+            'number': build_details.get('number', build['number']),
+            'timestamp': build_details.get('timestamp', build.get('timestamp', 0)),
+            'duration': build_details.get('duration', build.get('duration', 0)),
+            'result': build_details.get('result', build.get('result', 'UNKNOWN')),
+            'url': build_details.get('url', build.get('url', '')),
+            'user_info': self.extract_user_info(build_details)
+        }
+
+    def list_job_builds(self, job_name, job_full_name, after=0, limit=None):
+        """Get the build listing of a specific job - handles both simple and folder jobs
+
+        Only builds numbered above `after` are returned; `limit` restricts the listing
+        to the newest builds.
+        """
         logger.debug(f"Fetching builds for job: {job_full_name}")
-        job_data = self.make_jenkins_request(endpoint)
+        job_data = self.make_jenkins_request(self.job_builds_endpoint(job_full_name, limit))
         if not job_data:
             logger.warning(f"Could not fetch job data for: {job_name}")
             return []
 
-        builds = job_data.get('builds', [])
-        logger.info(f"Found {len(builds)} builds for job: {job_name}")
-        detailed_builds = []
+        return self.select_builds(job_name, job_data, after)
 
+    def detail_builds(self, job_full_name, builds):
+        """Yield the point record of each listed build, one at a time"""
         for build in builds:
-            build_number = build['number']
-            build_endpoint = f"/job/{encoded_job_path}/{build_number}/api/json"
+            if 'actions' in build:
+                yield self.detail_build(build)
+                continue
+
+            # Fall back to the build's own endpoint when the listing lacks its actions
+            build_endpoint = f"{self.job_endpoint(job_full_name)}/{build['number']}/api/json"
             build_details = self.make_jenkins_request(build_endpoint)
-            if build_details:
-                user_name = self.extract_user_info(build_details)
-                enhanced_build = {
-                    'number': build_details.get('number', build['number']),
-                    'timestamp': build_details.get('timestamp', build.get('timestamp', 0)),
-                    'duration': build_details.get('duration', build.get('duration', 0)),
-                    'result': build_details.get('result', build.get('result', 'UNKNOWN')),
-                    'url': build_details.get('url', build.get('url', '')),
-                    'user_info': user_name
-                }
-                detailed_builds.append(enhanced_build)
-            else:
-                build['user_info'] = 'Unknown'
-                detailed_builds.append(build)
-        return detailed_builds
+            yield self.detail_build(build, build_details or {})
+
+    def time_condition(self, time_range):
+        """InfluxQL bound on point time; points are stored at the build timestamp, so
+        this lets InfluxDB read only the shards covering those builds. A newest of None
+        leaves the range open towards the present"""
+        oldest, newest = time_range
+        if newest is None:
+            return f"time >= {oldest}ms"
+        return f"time >= {oldest}ms AND time <= {newest}ms"
 
-    def is_build_already_inserted(self, project_name, project_path, view_name, build_number):
+    def build_time_range(self, builds):
+        """(oldest, newest) timestamp in ms of the builds, None if any build lacks one"""
+        timestamps = [build.get('timestamp') for build in builds]
+        if not timestamps or None in timestamps:
+            return None
+        return min(timestamps), max(timestamps)
+
+    def duplicate_check_query(self, project_name, project_path, view_name, build_number, timestamp=None):
+        query = f"SELECT build_number FROM {self.measurement} WHERE project_name='{self.escape_influx_query(project_name)}' " \
+                f"AND project_path='{self.escape_influx_query(project_path)}' " \
+                f"AND view='{self.escape_influx_query(view_name)}' " \
+                f"AND server='{self.escape_influx_query(self.jenkins_instance)}' " \
+                f"AND build_number={build_number}"
+        if timestamp is not None:
+            query += f" AND {self.time_condition((timestamp, timestamp))}"
+        return query
+
+    def query_endpoint(self, query):
+        """/query path for an InfluxQL query, with times returned as epoch milliseconds"""
+        return f"/query?db={self.influx_db}&epoch=ms&q={urllib.parse.quote(query)}"
+
+    def is_build_already_inserted(self, project_name, project_path, view_name, build_number, timestamp=None):
         try:
-            query = f"SELECT build_number FROM {self.measurement} WHERE project_name='{self.escape_influx_query(project_name)}' " \
-                    f"AND project_path='{self.escape_influx_query(project_path)}' " \
-                    f"AND view='{self.escape_influx_query(view_name)}' " \
-                    f"AND server='{self.escape_influx_query(self.jenkins_instance)}' " \
-                    f"AND build_number={build_number}"
-            encoded_query = urllib.parse.quote(query)
-            response = self.make_influx_request(f"/query?db={self.influx_db}&q={encoded_query}")
+            query = self.duplicate_check_query(project_name, project_path, view_name, build_number, timestamp)
+            response = self.make_influx_request(self.query_endpoint(query))
             if response and response.text:
                 return '"series"' in response.text
             return False
@@ -226,12 +1188,100 @@ class JenkinsInfluxCollector:
             logger.warning(f"Error checking duplicate: {e}")
             return False
 
+    def parse_influx_series(self, payload):
+        """Series of a decoded /query response, or None if any statement failed"""
+        series = []
+        for result in payload.get('results', []):
+            if 'error' in result:
+                logger.warning(f"InfluxDB query error: {result['error']}")
+                return None
+            series.extend(result.get('series', []))
+        return series
+
+    def query_influx(self, query):
+        """Run an InfluxQL query and return its series, or None if the query failed"""
+        response = self.make_influx_request(self.query_endpoint(query))
+        if response is None:
+            return None
+        try:
+            payload = json_loads(response.content)
+        except ValueError as e:
+            logger.warning(f"Error parsing InfluxDB query response: {e}")
+            return None
+        return self.parse_influx_series(payload)
+
+    def inserted_builds_query(self, view_name=None, project_name=None, project_path=None, build_range=None,
+                              time_range=None):
+        conditions = [f"server='{self.escape_influx_query(self.jenkins_instance)}'"]
+        if view_name is not None:
+            conditions.append(f"view='{self.escape_influx_query(view_name)}'")
+        if project_path is not None:
+            conditions.append(f"project_name='{self.escape_influx_query(project_name)}'")
+            conditions.append(f"project_path='{self.escape_influx_query(project_path)}'")
+        if build_range is not None:
+            conditions.append(f"build_number >= {build_range[0]} AND build_number <= {build_range[1]}")
+        if time_range is not None:
+            conditions.append(self.time_condition(time_range))
+        return f"SELECT build_number FROM {self.measurement} WHERE {' AND '.join(conditions)} " \
+               f"GROUP BY view, project_name, project_path"
+
+    def parse_inserted_build_numbers(self, series):
+        """Map (view, project_name, project_path) to the set of stored build numbers"""
+        inserted = {}
+        for serie in series:
+            tags = serie.get('tags', {})
+            key = (tags.get('view', ''), tags.get('project_name', ''), tags.get('project_path', ''))
+            column = serie.get('columns', []).index('build_number')
+            numbers = inserted.setdefault(key, set())
+            numbers.update(row[column] for row in serie.get('values', []) if row[column] is not None)
+        return inserted
+
+    def get_inserted_build_numbers(self, view_name=None, project_name=None, project_path=None, build_range=None,
+                                   time_range=None):
+        """Fetch stored build numbers of a view or of one job (in all its views) in a single query.
+
+        build_range=(first, last) restricts the query to those build numbers and
+        time_range=(oldest, newest) to builds started in that span (ms timestamps).
+        Returns a dict mapping (view, project_name, project_path) to a set of build numbers,
+        or None when InfluxDB could not be queried.
+        """
+        series = self.query_influx(self.inserted_builds_query(view_name, project_name, project_path, build_range,
+                                                              time_range))
+        if series is None:
+            return None
+        return self.parse_inserted_build_numbers(series)
+
+    def get_recorded_watermark(self, builds, recorded):
+        """Advance `recorded` over consecutive finished builds, stopping at the first one still running"""
+        for build in sorted(builds, key=lambda b: b['number']):
+            if build['number'] <= recorded:
+                continue
+            if build.get('result') is None:
+                break
+            recorded = build['number']
+        return recorded
+
+    def view_jobs_endpoint(self, view):
+        """Endpoint listing a view's jobs; a view without /view/ in its URL is the root view"""
+        view_url = view.get('url', '')
+        if '/view/' in view_url:
+            # Parse view name from URL (e.g., http://jenkins/view/Capstone-project/)
+            view_path = view_url.rstrip('/').split('/view/')[-1]
+            return f"/view/{urllib.parse.quote(view_path, safe='')}/api/json?tree=jobs[{JOB_TREE}]"
+        return f"/api/json?tree=jobs[{JOB_TREE}]"
+
     def get_jenkins_views(self):
         """Get all views and their jobs from Jenkins"""
         logger.info("Fetching Jenkins views...")
+        started = time.monotonic()
         
-        # First, get the list of views
-        jenkins_data = self.make_jenkins_request('/api/json?tree=views[name,url,_class]')
+        # One nested request normally returns every view with its jobs
+        jenkins_data = self.make_jenkins_request(f'/api/json?tree={VIEWS_TREE}')
+        discovery_requests = 1
+        if not jenkins_data:
+            logger.warning("Nested view discovery failed - fetching jobs view by view")
+            jenkins_data = self.make_jenkins_request('/api/json?tree=views[name,url,_class]')
+            discovery_requests += 1
         
         if not jenkins_data:
             logger.error("Failed to fetch any data from Jenkins API")
@@ -240,20 +1290,18 @@ class JenkinsInfluxCollector:
         views = jenkins_data.get('views', [])
         logger.info(f"Found {len(views)} views")
         
-        # Now fetch jobs for each view individually
+        # Fetch jobs individually for any view the nested request did not cover
         for view in views:
             view_name = view.get('name', 'Unknown')
             view_url = view.get('url', '')
             
-            # Extract view path from URL for API call
-            if '/view/' in view_url:
-                # Parse view name from URL (e.g., http://jenkins/view/Capstone-project/)
-                view_path = view_url.rstrip('/').split('/view/')[-1]
-                
+            if 'jobs' in view:
+                logger.info(f"View '{view_name}' has {len(view['jobs'])} jobs")
+            elif '/view/' in view_url:
                 # Fetch jobs for this specific view
-                view_endpoint = f"/view/{urllib.parse.quote(view_path, safe='')}/api/json?tree=jobs[name,fullName,url,_class]"
                 logger.info(f"Fetching jobs for view '{view_name}'")
-                view_data = self.make_jenkins_request(view_endpoint)
+                view_data = self.make_jenkins_request(self.view_jobs_endpoint(view))
+                discovery_requests += 1
                 
                 if view_data:
                     view['jobs'] = view_data.get('jobs', [])
@@ -265,29 +1313,331 @@ class JenkinsInfluxCollector:
                 # This is the "all" view or root view
                 logger.info(f"View '{view_name}' is root/all view")
                 # Fetch root level jobs
-                root_data = self.make_jenkins_request('/api/json?tree=jobs[name,fullName,url,_class]')
+                root_data = self.make_jenkins_request(self.view_jobs_endpoint(view))
+                discovery_requests += 1
                 if root_data:
                     view['jobs'] = root_data.get('jobs', [])
                     logger.info(f"View '{view_name}' has {len(view['jobs'])} jobs")
                 else:
                     view['jobs'] = []
         
+        # Replace folders by the jobs inside them; each folder is fetched at most once
+        folder_cache = {}
+        for view in views:
+            view['jobs'] = self.expand_folder_jobs(view['jobs'], folder_cache)
+        if folder_cache:
+            logger.info(f"Fetched {len(folder_cache)} folder(s) nested deeper than FOLDER_DEPTH={FOLDER_DEPTH}")
+        discovery_requests += len(folder_cache)
+        
+        # Written on its own so it does not count towards the build totals
+        self.write_points(self.format_discovery_point(views, time.monotonic() - started, discovery_requests))
         return views
 
-    def process_jobs_and_builds(self):
-        """Main processing function"""
-        logger.info("Starting job and build processing...")
+    def is_job_container(self, job):
+        """Folders, organization folders and multibranch projects hold jobs instead of builds"""
+        job_class = job.get('_class', '')
+        return 'jobs' in job or 'Folder' in job_class or 'MultiBranch' in job_class
+
+    def folder_jobs_endpoint(self, folder):
+        return f"{self.job_endpoint(folder.get('fullName', folder['name']))}/api/json?tree=jobs[{JOB_TREE}]"
+
+    def expand_folder_jobs(self, jobs, folder_cache):
+        """Leaf jobs of a job list, descending into folders recursively.
+
+        Folders whose children were not returned inline (deeper than FOLDER_DEPTH) are
+        fetched with another depth-limited request; folder_cache maps their fullName to
+        the response so a folder listed in several views is fetched once.
+        """
+        leaf_jobs = []
+        for job in jobs:
+            if not self.is_job_container(job):
+                leaf_jobs.append(job)
+                continue
+            children = job.get('jobs')
+            if children is None:
+                folder_full_name = job.get('fullName', job['name'])
+                if folder_full_name not in folder_cache:
+                    logger.info(f"Fetching jobs of folder: {folder_full_name}")
+                    folder_cache[folder_full_name] = self.make_jenkins_request(self.folder_jobs_endpoint(job))
+                folder_data = folder_cache[folder_full_name]
+                children = folder_data.get('jobs', []) if folder_data else []
+            leaf_jobs.extend(self.expand_folder_jobs(children, folder_cache))
+        return leaf_jobs
+
+    def format_discovery_point(self, views, seconds, discovery_requests):
+        """Line-protocol point describing how long discovery took and how many requests it needed"""
+        logger.info(f"Discovery took {seconds:.2f}s and {discovery_requests} request(s)")
+        job_count = sum(len(view.get('jobs', [])) for view in views)
+        return (f"{COLLECTOR_METRICS_MEASUREMENT},"
+                f"server={self.escape_value(self.jenkins_instance)} "
+                f"discovery_seconds={seconds:.3f},"
+                f"discovery_requests={discovery_requests}i,"
+                f"views={len(views)}i,"
+                f"jobs={job_count}i "
+                f"{time.time_ns() // INFLUX_PRECISION_NS[self.encoder.precision]}").encode('utf-8')
+
+    def view_load_range(self, loads, oldest):
+        """Time range a job listing builds back to `oldest` still needs loaded for its view,
+        None when the view's loads already cover it. Loads cover one span reaching to the present"""
+        covered = min((start for start, _ in loads), default=None)
+        if covered is None:
+            return oldest, None
+        if oldest < covered:
+            return oldest, covered - 1
+        return None
+
+    def get_view_known_builds(self, view_name, job_name, job_full_name, oldest):
+        """Stored build numbers of a job in a view, from view-wide queries shared by its jobs.
+
+        The first job to need a view queries it from its oldest listed build onwards; a
+        job listing older builds extends that with one query for the missing span. Workers
+        wait only for the loads of their own view. None when InfluxDB could not be queried;
+        a failed load drops the view's loads so the next job queries it again.
+        """
+        with self.dedup_lock:
+            loads = self.view_inserted.setdefault(view_name, [])
+            time_range = self.view_load_range(loads, oldest)
+            if time_range is not None:
+                future = Future()
+                loads.append((time_range[0], future))
+            needed = list(loads)
+        if time_range is not None:
+            try:
+                inserted = self.get_inserted_build_numbers(view_name, time_range=time_range)
+            except Exception as e:
+                inserted = None
+                logger.warning(f"Error loading inserted builds of view {view_name}: {e}")
+            future.set_result(inserted)
+        known = set()
+        for _, future in needed:
+            inserted = future.result()
+            if inserted is None:
+                with self.dedup_lock:
+                    if self.view_inserted.get(view_name) is loads:
+                        del self.view_inserted[view_name]
+                return None
+            known.update(inserted.get((view_name, job_name, job_full_name), ()))
+        return known
+
+    def new_job_result(self):
+        return {'processed': 0, 'unchanged': 0, 'queued': 0, 'skipped': 0, 'users': Counter()}
+
+    def plan_job(self, job, view_names=None):
+        """Decide how much of a job to fetch based on its recorded state.
+
+        Returns None when the job's probe numbers and views match the state and every
+        completed build is recorded, otherwise (recorded, last_build, limit): builds above
+        `recorded` are new and the listing can be limited to the newest `limit` builds.
+        Views the job joined since are found with joined_views().
+        """
+        job_full_name = job.get('fullName', job['name'])
+        job_state = self.state.get(self.jenkins_instance, job_full_name) if self.state else None
+        recorded = job_state['recorded'] if job_state else 0
+        probe = self.job_probe(job)
+        last_build = probe['last_build']
+        if job_state and last_build is not None and last_build < recorded:
+            # Deleted and recreated, numbering restarted below the recorded watermark
+            logger.info(f"Build numbers of {job['name']} restarted below #{recorded}, collecting it from scratch")
+            job_state, recorded = None, 0
+        # A build still running above lastCompletedBuild changes nothing until it finishes
+        last_completed = probe['last_completed'] if probe['last_completed'] is not None else last_build
+        if job_state and last_build is not None and recorded >= last_completed \
+                and all(job_state.get(field) == value for field, value in probe.items()) \
+                and not self.joined_views(job, view_names or ()):
+            logger.debug(f"Unchanged since last run: {job['name']} (last build #{last_build})")
+            return None
+        limit = last_build - recorded if job_state and last_build else None
+        return recorded, last_build, limit
+
+    def joined_views(self, job, view_names):
+        """Views a recorded job was not in last time; all of its listed builds are new to them.
+
+        Entries saved before view membership was recorded count as unchanged.
+        """
+        job_state = self.state.get(self.jenkins_instance, job.get('fullName', job['name'])) if self.state else None
+        if not job_state or 'views' not in job_state:
+            return []
+        return [view_name for view_name in view_names if view_name not in job_state['views']]
+
+    def listing_truncated(self, builds, recorded, limit):
+        """True if a limited listing may have missed builds just above `recorded`"""
+        return bool(limit and len(builds) >= limit and min(b['number'] for b in builds) > recorded + 1)
+
+    def job_probe(self, job):
+        """lastBuild, lastCompletedBuild and nextBuildNumber of a job, None where not fetched"""
+        return {
+            'last_build': (job.get('lastBuild') or {}).get('number', 0) if 'lastBuild' in job else None,
+            'last_completed': (job.get('lastCompletedBuild') or {}).get('number', 0)
+                              if 'lastCompletedBuild' in job else None,
+            'next_build': job.get('nextBuildNumber'),
+        }
+
+    def record_job_state(self, job, builds, recorded, view_names):
+        if self.state:
+            probe = self.job_probe(job)
+            if probe['last_build'] is None:
+                probe['last_build'] = recorded
+            self.state.update(self.jenkins_instance, job.get('fullName', job['name']),
+                              recorded=self.get_recorded_watermark(builds, recorded), **probe,
+                              views=sorted(view_names))
+
+    def process_job(self, job, view_names):
+        """Scrape one job once and queue its new builds for every view it belongs to.
+
+        Called from the worker threads; returns the job's counters so the caller can
+        aggregate them without shared state.
+        """
+        result = self.new_job_result()
+        job_name = job['name']
+        job_full_name = job.get('fullName', job_name)
+        job_class = job.get('_class', '')
         
-        views = self.get_jenkins_views()
-        if not views:
-            logger.error("No views found - exiting")
-            return False
+        logger.info(f"Processing job: {job_name} (type: {job_class})")
+        
+        # Skip folder jobs - they don't have builds
+        if self.is_job_container(job):
+            logger.info(f"Skipping folder: {job_name}")
+            return result
+        
+        result['processed'] = 1
+        
+        plan = self.plan_job(job, view_names)
+        if plan is None:
+            result['unchanged'] = 1
+            return result
+        recorded, last_build, limit = plan
+        
+        joined_views = self.joined_views(job, view_names)
+        if joined_views:
+            logger.info(f"{job_name} joined view(s) {', '.join(joined_views)}, listing all of its builds")
+            listing = self.list_job_builds(job_name, job_full_name)
+        else:
+            listing = self.list_job_builds(job_name, job_full_name, after=recorded, limit=limit)
+            if self.listing_truncated(listing, recorded, limit):
+                # A build started after discovery pushed older unrecorded ones out of the window
+                listing = self.list_job_builds(job_name, job_full_name, after=recorded)
+        self.record_job_state(job, listing, recorded, view_names)
+        
+        if not listing:
+            logger.warning(f"No builds found for job: {job_name}")
+            return result
+        
+        self.record_job_activity(job_full_name, listing)
+        known_builds = self.get_known_builds(job_name, job_full_name, view_names,
+                                             time_range=self.build_time_range(listing))
+        # Each build is detailed, checked and queued for all its views before the next one
+        for build in self.detail_builds(job_full_name, listing):
+            result['users'][build.get('user_info', 'Unknown')] += 1
+            for view_name in view_names:
+                # Builds up to the watermark are only new to the views the job just joined
+                if build['number'] > recorded or view_name in joined_views:
+                    self.queue_build(job_name, job_full_name, view_name, build, known_builds[view_name], result)
+        return result
+
+    def record_job_activity(self, job_full_name, listing):
+        timestamps = [build.get('timestamp', 0) for build in listing]
+        running = any(build.get('result') is None for build in listing)
+        self.job_activity[job_full_name] = (max(timestamps), min(timestamps), len(listing), running)
 
-        total_jobs_processed = 0
-        total_builds_processed = 0
-        skipped_builds = 0
-        user_stats = {}
+    def get_known_builds(self, job_name, job_full_name, view_names, build_range=None, time_range=None):
+        """Stored build numbers of a job per view; None for a view means check each build"""
+        if DEDUP_MODE == 'none':
+            return {view_name: set() for view_name in view_names}
+        if DEDUP_MODE == 'job' or (build_range and DEDUP_MODE != 'build'):
+            inserted = self.get_inserted_build_numbers(project_name=job_name, project_path=job_full_name,
+                                                       build_range=build_range, time_range=time_range)
+            return {view_name: inserted.get((view_name, job_name, job_full_name), set()) if inserted is not None
+                    else None for view_name in view_names}
+        if DEDUP_MODE == 'view':
+            oldest = time_range[0] if time_range else 0
+            return {view_name: self.get_view_known_builds(view_name, job_name, job_full_name, oldest)
+                    for view_name in view_names}
+        return dict.fromkeys(view_names)
 
+    def queue_build(self, job_name, job_full_name, view_name, build, known_builds, result):
+        """Queue a build unless it is already stored for this view; None for known_builds queries InfluxDB"""
+        build_number = build['number']
+        if build.get('result') is None:
+            # Still running; the watermark stops below it, so it is listed again once finished
+            logger.debug(f"Skipped running build: {job_name} #{build_number}")
+            return
+        if known_builds is not None:
+            already_inserted = build_number in known_builds
+        else:
+            already_inserted = self.is_build_already_inserted(job_name, job_full_name, view_name, build_number,
+                                                              build.get('timestamp'))
+        
+        if not already_inserted:
+            queued = self.insert_build_to_influx(job_name, job_full_name, view_name, build)
+            if queued:
+                result['queued'] += 1
+            elif queued is None:
+                result['skipped'] += 1
+                logger.debug(f"Skipped unchanged point: {job_name} #{build_number}")
+        else:
+            result['skipped'] += 1
+            logger.debug(f"Skipped duplicate: {job_name} #{build_number}")
+
+    def backfill_job(self, job, view_names):
+        """Page through a job's whole allBuilds history, writing and checkpointing each page.
+
+        Only one page of builds is held at a time; an interrupted backfill resumes from
+        the last page that was fully written.
+        """
+        result = self.new_job_result()
+        job_name = job['name']
+        job_full_name = job.get('fullName', job_name)
+        if self.is_job_container(job):
+            return result
+        
+        result['processed'] = 1
+        checkpoint = self.backfill_state.get(self.jenkins_instance, job_full_name) or {}
+        if checkpoint.get('done'):
+            result['unchanged'] = 1
+            logger.debug(f"Backfill already complete: {job_name}")
+            return result
+        
+        start = checkpoint.get('next', 0)
+        while True:
+            # allBuilds{M,N} is newest first; a build started meanwhile only shifts one
+            # already written build into the next page, where dedup skips it
+            end = start + BACKFILL_PAGE_SIZE
+            endpoint = f"{self.job_endpoint(job_full_name)}/api/json?tree=allBuilds[{BUILD_FIELDS}]{{{start},{end}}}"
+            page = self.get_jenkins_array(endpoint, 'allBuilds')
+            if page is None:
+                logger.warning(f"Backfill of {job_name} stopped at offset {start}, will resume there")
+                return result
+            
+            logger.info(f"Backfill {job_name}: builds {start}-{start + len(page)} of history")
+            if page:
+                numbers = [build['number'] for build in page]
+                known_builds = self.get_known_builds(job_name, job_full_name, view_names,
+                                                     build_range=(min(numbers), max(numbers)),
+                                                     time_range=self.build_time_range(page))
+                for build in self.detail_builds(job_full_name, page):
+                    result['users'][build.get('user_info', 'Unknown')] += 1
+                    for view_name in view_names:
+                        self.queue_build(job_name, job_full_name, view_name, build, known_builds[view_name], result)
+            
+            # Only checkpoint once the page is safely in InfluxDB
+            self.writer.flush()
+            if (self.jenkins_instance, job_full_name) in self.writer.failed_keys:
+                logger.error(f"Backfill of {job_name} stopped at offset {start} after a failed write")
+                return result
+            done = len(page) < BACKFILL_PAGE_SIZE
+            self.backfill_state.update(self.jenkins_instance, job_full_name, next=start + len(page), done=done)
+            self.backfill_state.save(server=self.jenkins_instance)
+            if done:
+                logger.info(f"Backfill of {job_name} complete")
+                return result
+            start = end
+
+    def select_jobs(self, views):
+        """Jobs to scrape with the views they appear in, leaving out the 'All' and 'Monitoring' views.
+
+        Returns (job, view names) pairs so a job listed in several views is fetched once.
+        """
+        jobs_by_name = {}
         for view in views:
             view_name = view['name']
             logger.info(f"Processing view: {view_name}")
@@ -304,48 +1654,94 @@ class JenkinsInfluxCollector:
             
             jobs = view.get('jobs', [])
             logger.info(f"Found {len(jobs)} jobs in view '{view_name}'")
-            
             for job in jobs:
-                job_name = job['name']
-                job_full_name = job.get('fullName', job_name)
-                job_class = job.get('_class', '')
-                
-                logger.info(f"Processing job: {job_name} (type: {job_class})")
-                
-                # Skip folder jobs - they don't have builds
-                if 'Folder' in job_class:
-                    logger.info(f"Skipping folder: {job_name}")
-                    continue
-                
-                total_jobs_processed += 1
-                builds = self.get_job_builds(job_name, job_full_name)
-                
-                if not builds:
-                    logger.warning(f"No builds found for job: {job_name}")
-                    continue
-                
-                for build in builds:
-                    build_number = build['number']
-                    user_name = build.get('user_info', 'Unknown')
-                    
-                    if user_name in user_stats:
-                        user_stats[user_name] += 1
-                    else:
-                        user_stats[user_name] = 1
-                    
-                    if not self.is_build_already_inserted(job_name, job_full_name, view_name, build_number):
-                        if self.insert_build_to_influx(job_name, job_full_name, view_name, build):
-                            total_builds_processed += 1
-                    else:
-                        skipped_builds += 1
-                        logger.debug(f"Skipped duplicate: {job_name} #{build_number}")
+                job_full_name = job.get('fullName', job['name'])
+                jobs_by_name.setdefault(job_full_name, (job, []))[1].append(view_name)
+        
+        shared_jobs = sum(1 for _, view_names in jobs_by_name.values() if len(view_names) > 1)
+        if shared_jobs:
+            logger.info(f"{shared_jobs} job(s) appear in several views and are fetched once")
+        return list(jobs_by_name.values())
 
+    def process_jobs_and_builds(self, job_processor=None):
+        """Main processing function; job_processor defaults to process_job"""
+        logger.info("Starting job and build processing...")
+        job_processor = job_processor or self.process_job
+        
+        views = self.get_jenkins_views()
+        if not views:
+            logger.error("No views found - exiting")
+            return False
+
+        totals = self.new_job_result()
+        written_before = self.writer.written_by[self.jenkins_instance]
+        failed_before = self.writer.failed_by[self.jenkins_instance]
+        jobs = self.select_jobs(views)
+
+        # Dedup sets are per run; a view's set is loaded lazily by the first job that needs it
+        self.view_inserted = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.jenkins_instance) as pool:
+            for result in self.map_jobs(pool, job_processor, jobs):
+                for counter, value in result.items():
+                    totals[counter] += value
+
+        # Write whatever is still buffered before reporting the totals
+        self.writer.flush()
+        totals['inserted'] = self.writer.written_by[self.jenkins_instance] - written_before
+        totals['failed'] = self.writer.failed_by[self.jenkins_instance] - failed_before
+        self.save_progress()
+        return self.report_summary(views, totals)
+
+    def map_jobs(self, pool, job_processor, jobs):
+        """Like pool.map, but with only a few jobs per worker submitted at a time.
+
+        Results are yielded as jobs finish, so neither pending futures nor finished
+        results pile up for large controllers.
+        """
+        pending = set()
+        for job, view_names in jobs:
+            if len(pending) >= self.workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(pool.submit(job_processor, job, view_names))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def save_progress(self, writer=None, final=True):
+        """Persist job state and written point digests, leaving out jobs whose points failed.
+
+        `writer` is the one that wrote this run's points, the collector's own by default.
+        Its failed keys for this instance are consumed, so each cycle only drops its own failures.
+        Daemon polls pass final=False so the digest file is rewritten only now and then.
+        """
+        writer = writer or self.writer
+        failed_keys = writer.take_failed_keys(self.jenkins_instance)
+        if self.state:
+            self.state.save(failed_keys, server=self.jenkins_instance)
+        if self.written_points:
+            self.written_points.save(failed_keys, server=self.jenkins_instance, final=final)
+
+    def report_summary(self, views, totals):
+        """Log the run totals and user activity, returns the run's success"""
+        user_stats = totals['users']
         logger.info("")
         logger.info(f"=== SUMMARY FOR {self.jenkins_instance} ===")
         logger.info(f"Total views processed: {len([v for v in views if v['name'].lower() not in ['all', 'monitoring']])}")
-        logger.info(f"Total jobs processed: {total_jobs_processed}")
-        logger.info(f"Total new builds inserted: {total_builds_processed}")
-        logger.info(f"Total builds skipped: {skipped_builds}")
+        logger.info(f"Total jobs processed: {totals['processed']}")
+        if COLLECTOR_MODE == 'backfill':
+            logger.info(f"Total jobs already backfilled: {totals['unchanged']}")
+        elif self.state:
+            logger.info(f"Total jobs unchanged since last run: {totals['unchanged']}")
+        logger.info(f"Total new builds inserted: {totals['inserted']}")
+        logger.info(f"Total builds skipped: {totals['skipped']}")
+        if self.http_cache:
+            logger.info(f"HTTP cache: {self.http_cache.hits} response(s) reused, "
+                        f"{self.http_cache.revalidated} revalidated")
+        if totals['failed']:
+            logger.error(f"Total builds failed to insert: {totals['failed']} of {totals['queued']}")
         
         if user_stats:
             logger.info("=== USER ACTIVITY ===")
@@ -362,20 +1758,546 @@ class JenkinsInfluxCollector:
             return True
         else:
             logger.warning("No valid views to process")
-            return total_jobs_processed > 0
+            return totals['processed'] > 0
 
     def run(self):
         """Execute the collector"""
         try:
+            if COLLECTOR_MODE == 'backfill':
+                if self.backfill_state is None:
+                    self.backfill_state = JobStateStore(BACKFILL_STATE_FILE)
+                logger.info(f"Backfilling full build history, checkpoints in {BACKFILL_STATE_FILE}")
+                return self.process_jobs_and_builds(self.backfill_job)
+            if COLLECTOR_ENGINE == 'async':
+                if aiohttp is not None:
+                    return AsyncCollectorEngine(self).run()
+                logger.warning("COLLECTOR_ENGINE=async needs the aiohttp package - using the threaded engine")
             return self.process_jobs_and_builds()
         except Exception as e:
             logger.error(f"Unexpected error during execution: {e}", exc_info=True)
             return False
 
+    def run_daemon(self):
+        """Stay resident, rediscovering views and polling jobs on their own intervals until shutdown.
+
+        Sessions, job state and the discovered job list stay warm between cycles.
+        """
+        logger.info(f"Daemon mode: discovery every {DISCOVERY_INTERVAL}s, "
+                    f"job polls every {POLL_MIN_INTERVAL}-{POLL_MAX_INTERVAL}s depending on build activity")
+        if COLLECTOR_MODE == 'backfill' or COLLECTOR_ENGINE == 'async':
+            logger.warning("Daemon mode always runs incremental polls on the threaded engine")
+        if self.state is None:
+            # Watermarks skip finished builds between polls, just not across restarts
+            self.state = JobStateStore(None)
+        self.jobs = {}
+        self.views = {}
+        self.job_pace = {}
+        # Heap of (due time, job fullName); the '' entry is the next discovery. A job's
+        # entry is stale once next_poll holds a different due time for it
+        schedule = [(time.monotonic(), '')]
+        next_poll = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.jenkins_instance) as pool:
+            while not shutdown.is_set():
+                delay = schedule[0][0] - time.monotonic()
+                if delay > 0:
+                    shutdown.wait(delay)
+                    continue
+
+                now = time.monotonic()
+                due = []
+                while schedule and schedule[0][0] <= now:
+                    due_time, name = heapq.heappop(schedule)
+                    if not name or next_poll.get(name) == due_time:
+                        due.append(name)
+                try:
+                    if '' in due:
+                        due.remove('')
+                        heapq.heappush(schedule, (now + DISCOVERY_INTERVAL, ''))
+                        for job_full_name in self.discover_jobs():
+                            if job_full_name not in due:
+                                next_poll[job_full_name] = now
+                                heapq.heappush(schedule, (now, job_full_name))
+                    # Jobs no longer in any view drop out of the schedule here
+                    for name in due:
+                        if name not in self.jobs:
+                            next_poll.pop(name, None)
+                            self.job_pace.pop(name, None)
+                    due = [name for name in due if name in self.jobs]
+                    if due:
+                        self.poll_jobs(pool, due)
+                except Exception as e:
+                    logger.error(f"Unexpected error during daemon cycle: {e}", exc_info=True)
+                for job_full_name in due:
+                    due_time = time.monotonic() + self.next_poll_interval(job_full_name)
+                    next_poll[job_full_name] = due_time
+                    heapq.heappush(schedule, (due_time, job_full_name))
+
+        self.writer.flush()
+        self.save_progress()
+        logger.info(f"Daemon for {self.jenkins_instance} stopped")
+        return True
+
+    def discover_jobs(self):
+        """Refresh the daemon's job list, returns the fullNames of jobs to poll now.
+
+        Those are new jobs and jobs whose builds or views changed since the recorded
+        state; the others keep their place in the schedule.
+        """
+        views = self.get_jenkins_views()
+        if not views:
+            logger.error("No views found - keeping the previous job list")
+            return []
+        # Dedup sets are reloaded with each discovery so they don't go stale
+        self.view_inserted = {}
+        self.views = {view['name']: view for view in views}
+        known_jobs = self.jobs
+        self.jobs = {job.get('fullName', job['name']): (job, view_names)
+                     for job, view_names in self.select_jobs(views)}
+        return [job_full_name for job_full_name, (job, view_names) in self.jobs.items()
+                if job_full_name not in known_jobs or self.plan_job(job, view_names) is not None]
+
+    def probe_views(self, job_full_names):
+        """Refresh the probe fields of the given jobs with one request per view they appear in"""
+        view_names = {view_name for name in job_full_names for view_name in self.jobs[name][1]}
+        probed = {}
+        folder_cache = {}
+        for view_name in view_names:
+            view_data = self.make_jenkins_request(self.view_jobs_endpoint(self.views[view_name]))
+            if view_data is None:
+                logger.warning(f"Could not probe view '{view_name}'")
+                continue
+            for job in self.expand_folder_jobs(view_data.get('jobs', []), folder_cache):
+                probed[job.get('fullName', job['name'])] = job
+
+        probe_fields = ('lastBuild', 'lastCompletedBuild', 'nextBuildNumber')
+        for name in job_full_names:
+            job, job_view_names = self.jobs[name]
+            if name in probed:
+                job = probed[name]
+            else:
+                # Without fresh numbers the job is listed instead of compared
+                job = {k: v for k, v in job.items() if k not in probe_fields}
+            self.jobs[name] = (job, job_view_names)
+
+    def next_poll_interval(self, job_full_name):
+        """Seconds until a job's next poll, from its build rate; doubles while the job is idle"""
+        pace = self.job_pace.setdefault(job_full_name, {'interval': POLL_MIN_INTERVAL, 'gap': None, 'newest': None})
+        activity = self.job_activity.pop(job_full_name, None)
+        if activity is None:
+            # Nothing new since the last poll
+            pace['interval'] = min(pace['interval'] * 2, POLL_MAX_INTERVAL)
+            return pace['interval']
+
+        newest, oldest, count, running = activity
+        if pace['newest'] is None:
+            # First listing: average spacing of the builds Jenkins still lists
+            gap = (newest - oldest) / 1000 / (count - 1) if count > 1 else None
+        elif newest > pace['newest']:
+            gap = (newest - pace['newest']) / 1000 / count
+        else:
+            gap = None
+        if gap is not None:
+            pace['gap'] = gap if pace['gap'] is None else (pace['gap'] + gap) / 2
+        pace['newest'] = max(newest, pace['newest'] or 0)
+
+        if running or pace['gap'] is None:
+            # Poll again soon to pick up the result of a running build
+            pace['interval'] = POLL_MIN_INTERVAL
+        else:
+            pace['interval'] = min(max(pace['gap'] / 2, POLL_MIN_INTERVAL), POLL_MAX_INTERVAL)
+        return pace['interval']
+
+    def poll_jobs(self, pool, job_full_names):
+        """Process the given jobs once, then write their points and state"""
+        totals = self.new_job_result()
+        written_before = self.writer.written_by[self.jenkins_instance]
+        self.probe_views(job_full_names)
+        jobs = [self.jobs[name] for name in job_full_names]
+        for result in self.map_jobs(pool, self.process_job, jobs):
+            for counter, value in result.items():
+                totals[counter] += value
+        self.writer.flush()
+        self.save_progress(final=False)
+
+        inserted = self.writer.written_by[self.jenkins_instance] - written_before
+        logger.info(f"Polled {len(jobs)} job(s) on {self.jenkins_instance}: "
+                    f"{inserted} new build(s), {totals['skipped']} skipped, {totals['unchanged']} unchanged")
+
+
+class AsyncCollectorEngine:
+    """asyncio implementation of the collector's Jenkins and InfluxDB I/O.
+
+    Endpoints, parsing, state handling and line-protocol encoding are delegated to
+    the JenkinsInfluxCollector, so both engines write identical points.
+    """
+
+    def __init__(self, collector):
+        self.collector = collector
+        self.writer = AsyncInfluxBatchWriter(self.write_points, precision=collector.encoder.precision)
+        self.view_inserted = {}
+        self.jenkins = None
+        self.influx = None
+        self.jenkins_in_flight = None
+
+    async def make_jenkins_request(self, endpoint, timeout=30):
+        # Same quoting as requests applies, then handed to aiohttp as-is
+        url = requests.utils.requote_uri(f"{self.collector.jenkins_url}{endpoint}")
+        http_cache = self.collector.http_cache
+        cached = http_cache.get(url) if http_cache else None
+        if cached and cached.get('immutable'):
+            http_cache.hits += 1
+            return cached['data']
+
+        async def send():
+            rate_limiter = self.collector.rate_limiter
+            await asyncio.sleep(rate_limiter.reserve())
+            async with self.jenkins_in_flight:
+                started = time.monotonic()
+                try:
+                    async with self.jenkins.get(yarl.URL(url, encoded=True),
+                                                timeout=aiohttp.ClientTimeout(total=timeout),
+                                                headers=http_cache.validators(cached) if cached else None) as response:
+                        return response, await response.read()
+                finally:
+                    rate_limiter.observe(time.monotonic() - started)
+
+        try:
+            logger.debug(f"Making request to: {url}")
+            response, body = await self.collector.retry_policy.call_async(send, self.collector.jenkins_breaker)
+            if response.status == 304 and cached:
+                http_cache.revalidated += 1
+                return cached['data']
+            if response.status >= 400:
+                logger.error(f"HTTP Error {response.status} for {url}: {response.reason}")
+                if response.status == 404:
+                    logger.error("Resource not found - check if the job/endpoint exists")
+                elif response.status == 403:
+                    logger.error("Access forbidden - check credentials and permissions")
+                return None
+            data = json_loads(body)
+            if http_cache:
+                http_cache.put(url, data, response.headers)
+            return data
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as e:
+            logger.error(f"Error making request to {url}: {e}")
+            return None
+        except json.JSONDecodeError as e:
+            logger.error(f"Error parsing JSON from {url}: {e}")
+            return None
+
+    async def make_influx_request(self, endpoint, data=None, method='GET', headers=None):
+        """Returns the response body, or None on failure"""
+        url = f"{self.collector.influx_url}{endpoint}"
+
+        async def send():
+            async with self.influx.request(method, yarl.URL(url, encoded=True), data=data,
+                                           headers=headers) as response:
+                return response, await response.read()
+
+        try:
+            response, body = await self.collector.retry_policy.call_async(send, influx_breaker)
+            if response.status >= 400:
+                logger.error(f"Error {method} request to {url}: {response.status} {response.reason}")
+                return None
+            return body
+        except (aiohttp.ClientError, asyncio.TimeoutError, CircuitOpenError) as e:
+            logger.error(f"Error {method} request to {url}: {e}")
+            return None
+
+    async def write_points(self, payload, precision=None):
+        data, headers = self.collector.encode_write_body(payload)
+        body = await self.make_influx_request(self.collector.write_endpoint(precision),
+                                              data=data, method='POST', headers=headers)
+        return body is not None
+
+    async def query_influx(self, query):
+        body = await self.make_influx_request(self.collector.query_endpoint(query))
+        if body is None:
+            return None
+        try:
+            payload = json_loads(body)
+        except ValueError as e:
+            logger.warning(f"Error parsing InfluxDB query response: {e}")
+            return None
+        return self.collector.parse_influx_series(payload)
+
+    async def get_inserted_build_numbers(self, view_name=None, project_name=None, project_path=None, time_range=None):
+        series = await self.query_influx(self.collector.inserted_builds_query(view_name, project_name, project_path,
+                                                                              time_range=time_range))
+        if series is None:
+            return None
+        return self.collector.parse_inserted_build_numbers(series)
+
+    async def get_view_known_builds(self, view_name, job_name, job_full_name, oldest):
+        # Jobs of the same view await shared queries, extended back as older builds are listed
+        loads = self.view_inserted.setdefault(view_name, [])
+        time_range = self.collector.view_load_range(loads, oldest)
+        if time_range is not None:
+            loads.append((time_range[0], asyncio.ensure_future(
+                self.get_inserted_build_numbers(view_name, time_range=time_range))))
+        known = set()
+        for _, task in list(loads):
+            inserted = await task
+            if inserted is None:
+                if self.view_inserted.get(view_name) is loads:
+                    del self.view_inserted[view_name]
+                return None
+            known.update(inserted.get((view_name, job_name, job_full_name), ()))
+        return known
+
+    async def is_build_already_inserted(self, project_name, project_path, view_name, build_number, timestamp=None):
+        query = self.collector.duplicate_check_query(project_name, project_path, view_name, build_number, timestamp)
+        body = await self.make_influx_request(self.collector.query_endpoint(query))
+        return bool(body) and b'"series"' in body
+
+    async def get_jenkins_views(self):
+        logger.info("Fetching Jenkins views...")
+        started = time.monotonic()
+        jenkins_data = await self.make_jenkins_request(f'/api/json?tree={VIEWS_TREE}')
+        discovery_requests = 1
+        if not jenkins_data:
+            logger.warning("Nested view discovery failed - fetching jobs view by view")
+            jenkins_data = await self.make_jenkins_request('/api/json?tree=views[name,url,_class]')
+            discovery_requests += 1
+        if not jenkins_data:
+            logger.error("Failed to fetch any data from Jenkins API")
+            return []
+
+        views = jenkins_data.get('views', [])
+        logger.info(f"Found {len(views)} views")
+        missing = [view for view in views if 'jobs' not in view]
+        views_data = await asyncio.gather(*(self.make_jenkins_request(self.collector.view_jobs_endpoint(view))
+                                            for view in missing))
+        discovery_requests += len(missing)
+        for view, view_data in zip(missing, views_data):
+            view['jobs'] = view_data.get('jobs', []) if view_data else []
+            if not view_data:
+                logger.warning(f"Could not fetch jobs for view '{view.get('name', 'Unknown')}'")
+        for view in views:
+            logger.info(f"View '{view.get('name', 'Unknown')}' has {len(view['jobs'])} jobs")
+
+        folder_cache = {}
+        for view in views:
+            view['jobs'] = await self.expand_folder_jobs(view['jobs'], folder_cache)
+        discovery_requests += len(folder_cache)
+
+        await self.write_points(self.collector.format_discovery_point(views, time.monotonic() - started,
+                                                                      discovery_requests))
+        return views
+
+    async def expand_folder_jobs(self, jobs, folder_cache):
+        """Async counterpart of JenkinsInfluxCollector.expand_folder_jobs, fetching sibling folders concurrently"""
+        async def expand(job):
+            if not self.collector.is_job_container(job):
+                return [job]
+            children = job.get('jobs')
+            if children is None:
+                folder_full_name = job.get('fullName', job['name'])
+                if folder_full_name not in folder_cache:
+                    folder_cache[folder_full_name] = asyncio.ensure_future(
+                        self.make_jenkins_request(self.collector.folder_jobs_endpoint(job)))
+                folder_data = await folder_cache[folder_full_name]
+                children = folder_data.get('jobs', []) if folder_data else []
+            return await self.expand_folder_jobs(children, folder_cache)
+
+        expanded = await asyncio.gather(*(expand(job) for job in jobs))
+        return [leaf_job for group in expanded for leaf_job in group]
+
+    async def get_job_builds(self, job_name, job_full_name, after=0, limit=None):
+        collector = self.collector
+        job_data = await self.make_jenkins_request(collector.job_builds_endpoint(job_full_name, limit))
+        if not job_data:
+            logger.warning(f"Could not fetch job data for: {job_name}")
+            return []
+
+        async def detail(build):
+            if 'actions' in build:
+                return collector.detail_build(build)
+            build_details = await self.make_jenkins_request(
+                f"{collector.job_endpoint(job_full_name)}/{build['number']}/api/json")
+            return collector.detail_build(build, build_details or {})
+
+        return await asyncio.gather(*(detail(build) for build in collector.select_builds(job_name, job_data, after)))
+
+    async def process_job(self, job, view_names):
+        collector = self.collector
+        result = collector.new_job_result()
+        job_name = job['name']
+        job_full_name = job.get('fullName', job_name)
+        if collector.is_job_container(job):
+            logger.info(f"Skipping folder: {job_name}")
+            return result
+
+        result['processed'] = 1
+        plan = collector.plan_job(job, view_names)
+        if plan is None:
+            result['unchanged'] = 1
+            return result
+        recorded, last_build, limit = plan
+
+        joined_views = collector.joined_views(job, view_names)
+        if joined_views:
+            logger.info(f"{job_name} joined view(s) {', '.join(joined_views)}, listing all of its builds")
+            builds = await self.get_job_builds(job_name, job_full_name)
+        else:
+            builds = await self.get_job_builds(job_name, job_full_name, after=recorded, limit=limit)
+            if collector.listing_truncated(builds, recorded, limit):
+                builds = await self.get_job_builds(job_name, job_full_name, after=recorded)
+        collector.record_job_state(job, builds, recorded, view_names)
+        if not builds:
+            logger.warning(f"No builds found for job: {job_name}")
+            return result
+
+        for build in builds:
+            result['users'][build.get('user_info', 'Unknown')] += 1
+        # Running builds are written once they finish
+        builds = [build for build in builds if build.get('result') is not None]
+        if not builds:
+            return result
+
+        time_range = collector.build_time_range(builds)
+        inserted = None
+        if DEDUP_MODE == 'job':
+            inserted = await self.get_inserted_build_numbers(project_name=job_name, project_path=job_full_name,
+                                                             time_range=time_range)
+        elif DEDUP_MODE == 'none':
+            inserted = {}
+        for view_name in view_names:
+            # Builds up to the watermark are only new to the views the job just joined
+            view_builds = builds if view_name in joined_views else \
+                [build for build in builds if build['number'] > recorded]
+            if DEDUP_MODE == 'view':
+                known_builds = await self.get_view_known_builds(view_name, job_name, job_full_name,
+                                                                time_range[0] if time_range else 0)
+            elif inserted is not None:
+                known_builds = inserted.get((view_name, job_name, job_full_name), set())
+            else:
+                known_builds = None
+            if known_builds is None:
+                checks = await asyncio.gather(*(self.is_build_already_inserted(job_name, job_full_name, view_name,
+                                                                               build['number'], build.get('timestamp'))
+                                                for build in view_builds))
+                known_builds = {build['number'] for build, known in zip(view_builds, checks) if known}
+
+            for build in view_builds:
+                if build['number'] in known_builds:
+                    result['skipped'] += 1
+                    continue
+                try:
+                    payload, label = collector.format_build_point(job_name, job_full_name, view_name, build)
+                except Exception as e:
+                    logger.error(f"Error inserting build into InfluxDB: {e}")
+                    continue
+                key = (collector.jenkins_instance, job_full_name)
+                if collector.written_points and collector.written_points.seen(key, payload):
+                    result['skipped'] += 1
+                    continue
+                await self.writer.add(payload, label, key=key)
+                result['queued'] += 1
+        return result
+
+    async def process_jobs_and_builds(self):
+        collector = self.collector
+        logger.info(f"Starting job and build processing (async engine, {ASYNC_MAX_REQUESTS} requests in flight)...")
+        connector = aiohttp.TCPConnector(limit=ASYNC_MAX_REQUESTS, limit_per_host=ASYNC_LIMIT_PER_HOST)
+        self.jenkins_in_flight = asyncio.Semaphore(collector.rate_limiter.max_in_flight or ASYNC_MAX_REQUESTS)
+        auth = aiohttp.BasicAuth(collector.jenkins_user, collector.jenkins_token)
+        async with aiohttp.ClientSession(connector=connector, auth=auth,
+                                         headers={'Accept-Encoding': 'gzip'}) as self.jenkins, \
+                aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as self.influx:
+            views = await self.get_jenkins_views()
+            if not views:
+                logger.error("No views found - exiting")
+                return False
+
+            totals = collector.new_job_result()
+            results = await asyncio.gather(*(self.process_job(job, view_names)
+                                             for job, view_names in collector.select_jobs(views)))
+            for result in results:
+                for counter, value in result.items():
+                    totals[counter] += value
+
+            await self.writer.flush()
+        totals['inserted'] = self.writer.written
+        totals['failed'] = self.writer.failed
+        collector.save_progress(self.writer)
+        return collector.report_summary(views, totals)
+
+    def run(self):
+        return asyncio.run(self.process_jobs_and_builds())
+
+
+def load_instances(path):
+    """Collector arguments for each instance in a COLLECTOR_CONFIG file"""
+    try:
+        with open(path) as f:
+            config = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not read collector config {path}: {e}")
+        sys.exit(1)
+
+    instances = []
+    for entry in config.get('instances', []) if isinstance(config, dict) else config:
+        if not entry.get('name') or not entry.get('url'):
+            logger.error(f"Instance entries in {path} need a 'name' and a 'url': {entry}")
+            sys.exit(1)
+        user_env = entry.get('user_env', 'JENKINS_USER')
+        token_env = entry.get('token_env', 'JENKINS_TOKEN')
+        for env in (user_env, token_env):
+            if not os.getenv(env):
+                logger.error(f"{env} environment variable is required for instance {entry['name']} but not set")
+                sys.exit(1)
+        instances.append({
+            'jenkins_url': entry['url'],
+            'jenkins_user': os.getenv(user_env),
+            'jenkins_token': os.getenv(token_env),
+            'jenkins_instance': entry['name'],
+            'workers': int(entry.get('workers', COLLECTOR_WORKERS)),
+            'max_rps': float(entry.get('max_rps', JENKINS_MAX_RPS)),
+            'max_in_flight': int(entry.get('max_in_flight', JENKINS_MAX_IN_FLIGHT)),
+        })
+    if not instances:
+        logger.error(f"No instances configured in {path}")
+        sys.exit(1)
+    return instances
+
+def run_instances(instances, daemon=False):
+    """Scrape every instance concurrently, sharing one InfluxDB writer and the state files"""
+    state = JobStateStore(STATE_FILE) if STATE_FILE else None
+    backfill_state = JobStateStore(BACKFILL_STATE_FILE) if COLLECTOR_MODE == 'backfill' else None
+    http_cache = JenkinsResponseCache(HTTP_CACHE_DIR) if HTTP_CACHE_DIR else None
+    written_points = WrittenPointStore(WRITTEN_POINTS_FILE) if WRITTEN_POINTS_FILE else None
+    influx_session = new_influx_session()
+    collectors = []
+    writer = None
+    for instance in instances:
+        collector = JenkinsInfluxCollector(writer=writer, state=state, backfill_state=backfill_state,
+                                           http_cache=http_cache, influx_session=influx_session,
+                                           written_points=written_points, **instance)
+        writer = collector.writer
+        collectors.append(collector)
+
+    with ThreadPoolExecutor(max_workers=len(collectors), thread_name_prefix='instance') as pool:
+        results = list(pool.map(lambda collector: collector.run_daemon() if daemon else collector.run(), collectors))
+    for collector, success in zip(collectors, results):
+        if not success:
+            logger.error(f"Collection failed for {collector.jenkins_instance}")
+    return all(results)
+
+def request_shutdown(signum, frame):
+    logger.info(f"Received signal {signum}, shutting down after the current cycle")
+    shutdown.set()
 
 def main():
-    collector = JenkinsInfluxCollector()
-    success = collector.run()
+    daemon = '--daemon' in sys.argv[1:]
+    if daemon:
+        signal.signal(signal.SIGTERM, request_shutdown)
+        signal.signal(signal.SIGINT, request_shutdown)
+    if COLLECTOR_CONFIG:
+        success = run_instances(load_instances(COLLECTOR_CONFIG), daemon)
+    else:
+        collector = JenkinsInfluxCollector()
+        success = collector.run_daemon() if daemon else collector.run()
     sys.exit(0 if success else 1)
 
 